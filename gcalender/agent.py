@@ -8,10 +8,12 @@ from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
 
 from .calendar_utils import get_current_time
-from .create_events import create_event
+from .create_events import create_event, create_events_bulk
 from .list_events import list_events
+from .check_availability import check_availability
+from .free_busy import find_free_slots
 from .update_event import update_event
-from .delete_event import delete_event_by_name_and_date
+from .delete_event import delete_event_by_name_and_date, delete_events_by_criteria
 
 session_service = InMemorySessionService()
 # ============================================================
@@ -52,6 +54,7 @@ def create_gcalender_agent():
         - The calendar event link (`event_link`) for accessing or updating the event.
         - The Google Meet link (`meet_link`), if available, for joining the meeting.
     - Provide these links directly to the user in all responses.
+    - To create more than one event ("block 9-10 every weekday for two weeks", "import these 30 sessions"), call create_events_bulk once with all events; for repeating blocks pass one event plus an RRULE in recurrence (e.g. "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR;COUNT=10").
     - Example user response after creating an event:
     ```
     Your event is created!
@@ -68,9 +71,14 @@ def create_gcalender_agent():
     - If no date is mentioned, use today's date for start_date, which will default to today
     - If a specific date is mentioned, format it as YYYY-MM-DD
     - Always pass "primary" as the calendar_id
-    - Always pass 100 for max_results (the function internally handles this)
+    - Leave max_results at 0 to get every event in the range; set it only when the user wants the next N events
+    - Use compact=True for ranges longer than a week or when descriptions/attendees are not needed
     - For days, use 1 for today only, 7 for a week, 30 for a month, etc.
     
+    ## Availability
+    - For "am I free ..." questions use check_availability with the start and end of the window instead of listing events.
+    - To suggest meeting times ("find a 30-minute slot this week", "when are john@x.com and I both free?") use find_free_slots; pass other people's emails as attendees. It respects working hours unless the user asks otherwise.
+
     ## Deleting Events Guidelines (Upgraded)
     - Users can ask to delete events for a specific date, such as "today," "tonight," or for a keyword (like "delete all meetings today" or "delete tonight's events").
     - If the user specifies a date with words like "today," "tomorrow," or "tonight," map these as follows:
@@ -78,6 +86,7 @@ def create_gcalender_agent():
     - "tonight" → use current date + filter only events in the evening (for example, events after 6:00 PM)
     - If the user does not specify a date, prompt for clarification or default to deleting today’s events.
     - If the user says "delete all events," ask for confirmation before deleting everything on their calendar.
+    - To delete several events at once (e.g. "delete all meetings today"), use delete_events_by_criteria with the date and an optional name filter, after the user confirms.
     - Always confirm to the user which events were deleted and provide the event summaries and times in the response.
     - Example delete commands:
     - "Delete all meetings today."
@@ -102,10 +111,14 @@ def create_gcalender_agent():
     """,
     tools=[
         list_events,
+        check_availability,
+        find_free_slots,
         create_event,
+        create_events_bulk,
         update_event,
         # delete_event,
-        delete_event_by_name_and_date
+        delete_event_by_name_and_date,
+        delete_events_by_criteria,
     ],
 )
 
@@ -0,0 +1,120 @@
+import os
+import time
+import datetime
+import threading
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from gclient import execute_batch, get_credentials
+from gclient.identity import credentials_fingerprint
+from gcalender.calendar_utils import (
+    CALENDER_CREDENTIALS_PATH,
+    CALENDER_SCOPES,
+    authenticate_and_save,
+)
+
+# -----------------------------------------
+# CALENDAR SETTINGS CACHE
+# -----------------------------------------
+# Timezone, default reminders and working hours are loaded once per
+# credential (one HTTP batch call) and shared by every calendar tool.
+# After SETTINGS_TTL the cached value keeps being served while a
+# background thread reloads it.
+#
+# The Calendar API does not expose working hours, so they come from
+# CALENDAR_WORKDAY_START / CALENDAR_WORKDAY_END / CALENDAR_WORKDAYS.
+
+DEFAULT_TIMEZONE = os.getenv("CALENDAR_DEFAULT_TIMEZONE", "Asia/Dhaka")
+SETTINGS_TTL = int(os.getenv("CALENDAR_SETTINGS_TTL", "21600"))
+
+WORKING_HOURS = {
+    "start": os.getenv("CALENDAR_WORKDAY_START", "09:00"),
+    "end": os.getenv("CALENDAR_WORKDAY_END", "17:00"),
+    # Monday=0 ... Sunday=6
+    "days": [int(d) for d in os.getenv("CALENDAR_WORKDAYS", "0,1,2,3,4").split(",")],
+}
+
+_lock = threading.Lock()
+_settings = {}       # credential fingerprint -> (settings, loaded_at)
+_refreshing = set()  # fingerprints with a background reload in flight
+
+
+def _default_settings():
+    return {
+        "timezone": DEFAULT_TIMEZONE,
+        "default_reminders": [],
+        "week_start": 0,
+        "working_hours": WORKING_HOURS,
+    }
+
+
+def _load_settings(service):
+    (settings, settings_error), (primary, primary_error) = execute_batch(service, [
+        service.settings().list(fields="items(id,value)"),
+        service.calendarList().get(calendarId="primary", fields="defaultReminders"),
+    ])
+    if settings_error is not None:
+        raise settings_error
+    values = {item["id"]: item["value"] for item in settings.get("items", [])}
+    loaded = _default_settings()
+    loaded["timezone"] = values.get("timezone", DEFAULT_TIMEZONE)
+    loaded["week_start"] = int(values.get("weekStart", 0))
+    if primary_error is None:
+        loaded["default_reminders"] = primary.get("defaultReminders", [])
+    return loaded
+
+
+def _refresh_in_background(service, key):
+    def refresh():
+        try:
+            loaded = _load_settings(service)
+            with _lock:
+                _settings[key] = (loaded, time.time())
+        except Exception as e:
+            print(f"Calendar settings refresh failed, keeping cached values: {e}")
+        finally:
+            with _lock:
+                _refreshing.discard(key)
+
+    with _lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    threading.Thread(target=refresh, daemon=True).start()
+
+
+def get_calendar_settings(service):
+    """
+    Return the cached calendar settings for the current credential.
+
+    Args:
+        service: The pooled Calendar API client.
+
+    Returns:
+        dict: timezone, default_reminders, week_start and working_hours.
+    """
+    creds = get_credentials(CALENDER_CREDENTIALS_PATH, CALENDER_SCOPES, authenticate_and_save)
+    key = credentials_fingerprint(creds)
+    with _lock:
+        entry = _settings.get(key)
+
+    if entry is None:
+        try:
+            loaded = _load_settings(service)
+        except Exception as e:
+            print(f"Could not load calendar settings, using timezone {DEFAULT_TIMEZONE}: {e}")
+            return _default_settings()
+        with _lock:
+            _settings[key] = (loaded, time.time())
+        return loaded
+
+    if time.time() - entry[1] > SETTINGS_TTL:
+        _refresh_in_background(service, key)
+    return entry[0]
+
+
+def get_timezone(settings):
+    """Return the tzinfo for the calendar's timezone (UTC if it is unknown locally)."""
+    try:
+        return ZoneInfo(settings["timezone"])
+    except (ZoneInfoNotFoundError, ValueError):
+        return datetime.timezone.utc
@@ -1,11 +1,13 @@
 import os
+import re
 from datetime import datetime
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from functools import lru_cache
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 import pathlib
 
+from gclient import get_credentials, get_service, get_user_email
+
 KEYFILE_PATH = os.getcwd() + "/gcalender/credentials/oauth.keys.json"
 CALENDER_CREDENTIALS_PATH = os.getcwd() + "/gcalender/credentials/.calender-server-credentials.json"
 
@@ -51,10 +53,16 @@ def authenticate_and_save():
 
 
 def get_client():
-    """Return a Gmail API client."""
-    authenticate_and_save()
-    creds = Credentials.from_authorized_user_file(CALENDER_CREDENTIALS_PATH, CALENDER_SCOPES)
-    return build("calendar", "v3", credentials=creds)
+    """Return the pooled Calendar API client."""
+    return get_service("calendar", "v3", CALENDER_SCOPES, CALENDER_CREDENTIALS_PATH, authenticate_and_save)
+
+
+def get_calendar_user_email(service):
+    """Return the signed-in user's email (the primary calendar id), cached per credential."""
+    creds = get_credentials(CALENDER_CREDENTIALS_PATH, CALENDER_SCOPES, authenticate_and_save)
+    return get_user_email(
+        creds, lambda: service.calendars().get(calendarId="primary", fields="id").execute()["id"]
+    )
 
 
 def format_event_time(event_time):
@@ -77,35 +85,80 @@ def format_event_time(event_time):
     return "Unknown time format"
 
 
+_TIME = r"(?:\s+(?P<hour>\d{1,2}):(?P<minute>\d{1,2})(?:\s*(?P<ampm>[AaPp][Mm]))?)?\s*$"
+_DATE_PATTERNS = {
+    # 2023-12-31 2:00 PM (ISO dates that fromisoformat rejects)
+    "iso": re.compile(r"\s*(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})" + _TIME),
+    # 12/31/2023 14:00
+    "us": re.compile(r"\s*(?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<year>\d{4})" + _TIME),
+    # December 31, 2023 2:00 PM
+    "long": re.compile(r"\s*(?P<month_name>[A-Za-z]+)\s+(?P<day>\d{1,2}),\s*(?P<year>\d{4})" + _TIME),
+}
+_MONTHS = {
+    name.lower(): number
+    for number, full_name in enumerate(
+        ["January", "February", "March", "April", "May", "June", "July",
+         "August", "September", "October", "November", "December"], 1)
+    for name in (full_name, full_name[:3])
+}
+
+
+@lru_cache(maxsize=1024)
 def parse_datetime(datetime_str):
     """
     Parse a datetime string into a datetime object.
 
+    ISO strings go through datetime.fromisoformat; anything else is matched
+    against one regex picked from its shape instead of trying each strptime
+    format in turn. Results are memoized (datetimes are immutable).
+
     Args:
         datetime_str (str): A string representing a date and time
 
     Returns:
         datetime: A datetime object or None if parsing fails
     """
-    formats = [
-        "%Y-%m-%d %H:%M",
-        "%Y-%m-%d %I:%M %p",
-        "%Y-%m-%d",
-        "%m/%d/%Y %H:%M",
-        "%m/%d/%Y %I:%M %p",
-        "%m/%d/%Y",
-        "%B %d, %Y %H:%M",
-        "%B %d, %Y %I:%M %p",
-        "%B %d, %Y",
-    ]
-
-    for fmt in formats:
+    if not isinstance(datetime_str, str):
+        return None
+    text = datetime_str.strip()
+
+    # Fast path: "2023-12-31 14:00", "2023-12-31", "2023-12-31T14:00:00+06:00"
+    if text[:4].isdigit():
         try:
-            return datetime.strptime(datetime_str, fmt)
+            return datetime.fromisoformat(text)
         except ValueError:
-            continue
-
-    return None
+            pass
+
+    if "/" in text:
+        style = "us"
+    elif text[:1].isalpha():
+        style = "long"
+    else:
+        style = "iso"
+    match = _DATE_PATTERNS[style].match(text)
+    if not match:
+        return None
+
+    parts = match.groupdict()
+    if style == "long":
+        month = _MONTHS.get(parts["month_name"].lower())
+        if month is None:
+            return None
+    else:
+        month = int(parts["month"])
+
+    hour = minute = 0
+    if parts["hour"] is not None:
+        hour, minute = int(parts["hour"]), int(parts["minute"])
+        if parts["ampm"]:
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if parts["ampm"].lower() == "pm" else 0)
+
+    try:
+        return datetime(int(parts["year"]), month, int(parts["day"]), hour, minute)
+    except ValueError:
+        return None
 
 
 def get_current_time() -> dict:
@@ -0,0 +1,70 @@
+from gcalender.calendar_utils import get_client, parse_datetime
+from gcalender.calendar_settings import get_calendar_settings, get_timezone
+from gcalender.list_events import iter_events, format_event
+from gcalender import event_store
+
+AVAILABILITY_FIELDS = "nextPageToken,items(id,summary,start,end,transparency)"
+
+
+def check_availability(start_time: str, end_time: str) -> dict:
+    """
+    Check whether the user is free between two times.
+
+    Args:
+        start_time (str): Start of the window (e.g., "2023-12-31 14:00")
+        end_time (str): End of the window (e.g., "2023-12-31 15:00")
+
+    Returns:
+        dict: Whether the window is free and the events that conflict with it
+    """
+    try:
+        service = get_client()
+        if not service:
+            return {
+                "status": "error",
+                "message": "Failed to authenticate with Google Calendar. Please check credentials.",
+            }
+
+        start_dt = parse_datetime(start_time)
+        end_dt = parse_datetime(end_time)
+        if not start_dt or not end_dt or end_dt <= start_dt:
+            return {
+                "status": "error",
+                "message": "Invalid time window. Please use YYYY-MM-DD HH:MM format with end after start.",
+            }
+
+        settings = get_calendar_settings(service)
+        tz = get_timezone(settings)
+        if start_dt.tzinfo is None:
+            start_dt = start_dt.replace(tzinfo=tz)
+        if end_dt.tzinfo is None:
+            end_dt = end_dt.replace(tzinfo=tz)
+
+        # Answer from the local event store, or ask the Calendar API
+        if event_store.ensure_fresh(service):
+            events = event_store.events_between(start_dt.timestamp(), end_dt.timestamp())
+        else:
+            events = iter_events(
+                service,
+                "primary",
+                start_dt.isoformat(),
+                end_dt.isoformat(),
+                fields=AVAILABILITY_FIELDS,
+                time_zone=settings["timezone"],
+            )
+
+        conflicts = [
+            format_event(event, compact=True)
+            for event in events
+            if event.get("transparency") != "transparent"
+        ]
+
+        return {
+            "status": "success",
+            "free": not conflicts,
+            "message": "You are free." if not conflicts else f"{len(conflicts)} conflicting event(s).",
+            "conflicts": conflicts,
+        }
+
+    except Exception as e:
+        return {"status": "error", "message": f"Error checking availability: {str(e)}"}
@@ -1,6 +1,30 @@
+from gclient import execute_batch
 from gcalender.calendar_utils import get_client, parse_datetime
+from gcalender.calendar_settings import get_calendar_settings
+from gcalender import event_store
 import uuid
 
+
+def build_event_body(summary, start_dt, end_dt, timezone_id, with_meet=True, recurrence=""):
+    """Build an events.insert body, optionally with a Meet link and an RRULE."""
+    event_body = {
+        "summary": summary,
+        "start": {"dateTime": start_dt.isoformat(), "timeZone": timezone_id},
+        "end": {"dateTime": end_dt.isoformat(), "timeZone": timezone_id},
+    }
+    if with_meet:
+        event_body["conferenceData"] = {
+            "createRequest": {
+                "requestId": str(uuid.uuid4()),
+                "conferenceSolutionKey": {"type": "hangoutsMeet"}
+            }
+        }
+    if recurrence:
+        rule = recurrence.strip()
+        event_body["recurrence"] = [rule if rule.upper().startswith("RRULE:") else f"RRULE:{rule}"]
+    return event_body
+
+
 def create_event(summary: str, start_time: str, end_time: str) -> dict:
     """
     Create a new event in Google Calendar with an auto-generated Google Meet link.
@@ -31,27 +55,10 @@ def create_event(summary: str, start_time: str, end_time: str) -> dict:
                 "message": "Invalid date/time format. Please use YYYY-MM-DD HH:MM format.",
             }
 
-        timezone_id = "Asia/Dhaka"
-        try:
-            settings = service.settings().list().execute()
-            for setting in settings.get("items", []):
-                if setting.get("id") == "timezone":
-                    timezone_id = setting.get("value")
-                    break
-        except Exception:
-            pass  # Use default timezone if unable to fetch
-
-        event_body = {
-            "summary": summary,
-            "start": {"dateTime": start_dt.isoformat(), "timeZone": timezone_id},
-            "end": {"dateTime": end_dt.isoformat(), "timeZone": timezone_id},
-            "conferenceData": {
-                "createRequest": {
-                    "requestId": str(uuid.uuid4()),
-                    "conferenceSolutionKey": {"type": "hangoutsMeet"}
-                }
-            }
-        }
+        # Cached per credential, so creation is a single insert call
+        timezone_id = get_calendar_settings(service)["timezone"]
+
+        event_body = build_event_body(summary, start_dt, end_dt, timezone_id)
 
         event = service.events().insert(
             calendarId=calendar_id,
@@ -61,6 +68,7 @@ def create_event(summary: str, start_time: str, end_time: str) -> dict:
 
         print("=========================meet link=====================", event.get("hangoutLink", ""))
         print("==========================create event=====================", event)
+        event_store.apply_event(service, event)
 
         return {
             "status": "success",
@@ -74,6 +82,80 @@ def create_event(summary: str, start_time: str, end_time: str) -> dict:
         return {"status": "error", "message": f"Error creating event: {str(e)}"}
 
 
+def create_events_bulk(events: list[dict], recurrence: str = "", add_meet_link: bool = False) -> dict:
+    """
+    Create many events at once (sent as one batched request).
+
+    Args:
+        events (list[dict]): Events to create, each with "summary", "start_time"
+            and "end_time" (e.g., "2023-12-31 14:00").
+        recurrence (str): Optional RRULE applied to every event, e.g.
+            "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR;COUNT=10" for every weekday for two weeks.
+        add_meet_link (bool): Create a Google Meet link for each event.
+
+    Returns:
+        dict: Per-event status with event ids and links
+    """
+    try:
+        service = get_client()
+        if not service:
+            return {
+                "status": "error",
+                "message": "Failed to authenticate with Google Calendar. Please check credentials.",
+            }
+        if not events:
+            return {"status": "error", "message": "No events given.", "results": []}
+
+        # One cached timezone lookup for the whole batch
+        timezone_id = get_calendar_settings(service)["timezone"]
+
+        results = [None] * len(events)
+        requests = []
+        positions = []
+        for index, item in enumerate(events):
+            summary = item.get("summary", "")
+            start_dt = parse_datetime(item.get("start_time", ""))
+            end_dt = parse_datetime(item.get("end_time", ""))
+            if not summary or not start_dt or not end_dt:
+                results[index] = {
+                    "summary": summary,
+                    "status": "error",
+                    "message": "Each event needs summary, start_time and end_time (YYYY-MM-DD HH:MM).",
+                }
+                continue
+            body = build_event_body(summary, start_dt, end_dt, timezone_id, add_meet_link, recurrence)
+            requests.append(service.events().insert(
+                calendarId="primary",
+                body=body,
+                conferenceDataVersion=1 if add_meet_link else 0,
+            ))
+            positions.append(index)
+
+        for index, (event, error) in zip(positions, execute_batch(service, requests)):
+            summary = events[index].get("summary", "")
+            if error is not None:
+                results[index] = {"summary": summary, "status": "error", "message": str(error)}
+                continue
+            event_store.apply_event(service, event)
+            results[index] = {
+                "summary": summary,
+                "status": "success",
+                "event_id": event["id"],
+                "event_link": event.get("htmlLink", ""),
+                "meet_link": event.get("hangoutLink", ""),
+            }
+
+        created = sum(1 for r in results if r["status"] == "success")
+        return {
+            "status": "success" if created == len(results) else "partial" if created else "error",
+            "message": f"Created {created} of {len(results)} event(s).",
+            "results": results,
+        }
+
+    except Exception as e:
+        return {"status": "error", "message": f"Error creating events: {str(e)}"}
+
+
 
 
 # from gcalender.calendar_utils import get_client, parse_datetime
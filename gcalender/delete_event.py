@@ -1,5 +1,14 @@
+import datetime
+
+from googleapiclient.errors import HttpError
+
+from gclient import execute_batch
 from gcalender.calendar_utils import get_client
-from gcalender.list_events import list_events
+from gcalender.calendar_settings import get_calendar_settings, get_timezone
+from gcalender.list_events import iter_events
+from gcalender import event_store
+
+LOOKUP_FIELDS = "nextPageToken,items(id,summary,start,end)"
 
 
 def delete_event(
@@ -37,6 +46,7 @@ def delete_event(
 
         # Call the Calendar API to delete the event
         service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
+        event_store.remove_events([event_id])
 
         return {
             "status": "success",
@@ -47,34 +57,120 @@ def delete_event(
     except Exception as e:
         return {"status": "error", "message": f"Error deleting event: {str(e)}"}
     
-def delete_events_by_criteria(date=None, confirm=False):
-    # List events (today, date, all, etc.)
-    events = list_events(startdate=date, days=1 if date else 30)["events"]
-    if confirm:
-        for event in events:
-            delete_event(eventid=event["id"], confirm=True)
-        return f"Deleted {len(events)} events."
+def _day_window(service, date_str, days=1):
+    """Return (settings, start, end) for whole days in the calendar's timezone."""
+    settings = get_calendar_settings(service)
+    tz = get_timezone(settings)
+    if date_str and date_str.strip():
+        start = datetime.datetime.strptime(date_str.strip(), "%Y-%m-%d").replace(tzinfo=tz)
     else:
-        return "Please confirm batch deletion."
+        start = datetime.datetime.now(tz).replace(hour=0, minute=0, second=0, microsecond=0)
+    return settings, start, start + datetime.timedelta(days=days)
+
+
+def find_events(service, start, end, name="", settings=None):
+    """
+    Resolve events in a time window, optionally by name.
+
+    Uses the local event store when it is fresh; otherwise one events.list
+    call with Calendar's q full-text filter narrowed to the window.
+    """
+    if event_store.ensure_fresh(service):
+        return event_store.events_between(start.timestamp(), end.timestamp(), name=name or None)
+
+    events = iter_events(
+        service,
+        "primary",
+        start.isoformat(),
+        end.isoformat(),
+        fields=LOOKUP_FIELDS,
+        time_zone=settings["timezone"] if settings else None,
+        q=name or None,
+    )
+    # q also matches descriptions, locations and attendees; keep title matches.
+    return [e for e in events if name.lower() in e.get("summary", "").lower()]
+
+
+def delete_events_batch(service, event_ids):
+    """
+    Delete many events in one HTTP batch call.
+
+    Returns:
+        list: Per-event {"event_id", "status"[, "message"]} results.
+    """
+    requests = [
+        service.events().delete(calendarId="primary", eventId=event_id)
+        for event_id in event_ids
+    ]
+    results = []
+    deleted = []
+    for event_id, (_, error) in zip(event_ids, execute_batch(service, requests)):
+        # 410 Gone: the event was already deleted.
+        if error is None or (isinstance(error, HttpError) and error.resp.status == 410):
+            deleted.append(event_id)
+            results.append({"event_id": event_id, "status": "success"})
+        else:
+            results.append({"event_id": event_id, "status": "error", "message": str(error)})
+    event_store.remove_events(deleted)
+    return results
+
+
+def delete_events_by_criteria(date: str = "", name: str = "", confirm: bool = False) -> dict:
+    """
+    Delete every event on a date (or the next 30 days when no date is given),
+    optionally only those whose title contains name.
 
+    Args:
+        date (str): Date in YYYY-MM-DD format, empty for the next 30 days
+        name (str): Only delete events whose title contains this text (optional)
+        confirm (bool): Confirmation flag (must be set to True to delete)
+
+    Returns:
+        dict: Per-event deletion results
+    """
+    if not confirm:
+        return {"status": "error", "message": "Please confirm batch deletion by setting confirm=True"}
+
+    try:
+        service = get_client()
+        settings, start, end = _day_window(service, date, days=1 if date else 30)
+        events = find_events(service, start, end, name, settings)
+        if not events:
+            return {"status": "error", "message": "No matching events found.", "results": []}
 
-def delete_event_by_name_and_date(event_name, event_date:str | None):
+        results = delete_events_batch(service, [event["id"] for event in events])
+        deleted = sum(1 for r in results if r["status"] == "success")
+        summaries = {event["id"]: event.get("summary", "Untitled Event") for event in events}
+        for result in results:
+            result["summary"] = summaries.get(result["event_id"], "")
+        return {
+            "status": "success" if deleted == len(results) else "partial" if deleted else "error",
+            "message": f"Deleted {deleted} of {len(results)} event(s).",
+            "results": results,
+        }
+    except ValueError:
+        return {"status": "error", "message": f"Invalid date format: {date}. Use YYYY-MM-DD format."}
+    except Exception as e:
+        return {"status": "error", "message": f"Error deleting events: {str(e)}"}
+
+
+def delete_event_by_name_and_date(event_name: str, event_date: str | None):
     """
     Delete a Google Calendar event by name (summary) and date.
     event_name: str, name/summary of the event (case-insensitive match).
-    event_date: str, date in 'YYYY-MM-DD' format.
+    event_date: str, date in 'YYYY-MM-DD' format (empty for today).
     """
-    # List events for the given date
-    result = list_events(startdate=event_date, days=1)
-    events = result.get("events", [])
-    if not events:
-        return {"status": "error", "message": "No events found for the specified date."}
+    try:
+        service = get_client()
+        settings, start, end = _day_window(service, event_date)
+    except ValueError:
+        return {"status": "error", "message": f"Invalid date format: {event_date}. Use YYYY-MM-DD format."}
 
-    # Find the event by name (summary)
-    for event in events:
-        if event_name.lower() in event.get("summary", "").lower():
-            event_id = event.get("id")
-            # Call the existing delete function
-            return delete_event(eventid=event_id, confirm=True)
+    events = find_events(service, start, end, event_name, settings)
+    if not events:
+        return {"status": "error", "message": f"Event '{event_name}' not found on {start.date()}."}
 
-    return {"status": "error", "message": f"Event '{event_name}' not found on {event_date}."}
\ No newline at end of file
+    event = events[0]
+    result = delete_event(event_id=event["id"], confirm=True)
+    result["summary"] = event.get("summary", "")
+    return result
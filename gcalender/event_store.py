@@ -0,0 +1,200 @@
+import os
+import json
+import time
+import datetime
+
+from gclient import get_credentials
+from gclient.identity import credentials_fingerprint
+from gclient.local_db import Syncer, connect, set_state
+from gcalender.calendar_utils import (
+    CALENDER_CREDENTIALS_PATH,
+    CALENDER_SCOPES,
+    authenticate_and_save,
+)
+from gcalender.calendar_settings import get_calendar_settings, get_timezone
+
+# -----------------------------------------
+# LOCAL EVENT STORE
+# -----------------------------------------
+# Events of the primary calendar (expanded to single instances) are kept in
+# SQLite, indexed by start/end time and summary, and brought up to date
+# with the Calendar syncToken. Listing, name lookup and availability
+# checks read the store; an incremental sync runs when it is older than
+# STORE_MAX_AGE seconds. Writes made through the calendar tools are applied
+# to the store immediately. Callers fall back to the API whenever the
+# store is not ready.
+
+STORE_PATH = os.getcwd() + "/gcalender/credentials/.calendar-events.sqlite3"
+STORE_MAX_AGE = int(os.getenv("CALENDAR_STORE_MAX_AGE", "60"))
+CALENDAR_ID = "primary"
+
+# Event fields kept in the index (also requested from patch/insert calls)
+EVENT_FIELDS = (
+    "id,etag,status,summary,start,end,location,description,"
+    "attendees/email,htmlLink,hangoutLink,transparency,recurringEventId,recurrence"
+)
+SYNC_FIELDS = f"nextPageToken,nextSyncToken,items({EVENT_FIELDS})"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    summary_lc TEXT,
+    start_ts REAL,
+    end_ts REAL,
+    etag TEXT,
+    transparent INTEGER,
+    event_json TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_start ON events(start_ts);
+CREATE INDEX IF NOT EXISTS idx_events_end ON events(end_ts);
+CREATE INDEX IF NOT EXISTS idx_events_summary ON events(summary_lc);
+"""
+
+
+def _connect():
+    return connect(STORE_PATH, SCHEMA)
+
+
+def event_timestamp(event_time, tz):
+    """Epoch seconds for an event start/end ({"dateTime"} or all-day {"date"})."""
+    if "dateTime" in event_time:
+        return datetime.datetime.fromisoformat(event_time["dateTime"].replace("Z", "+00:00")).timestamp()
+    if "date" in event_time:
+        day = datetime.datetime.strptime(event_time["date"], "%Y-%m-%d")
+        return day.replace(tzinfo=tz).timestamp()
+    return 0.0
+
+
+def _store_events(conn, events, tz):
+    for event in events:
+        if event.get("status") == "cancelled":
+            conn.execute("DELETE FROM events WHERE id = ?", (event["id"],))
+            continue
+        conn.execute(
+            "INSERT OR REPLACE INTO events (id, summary_lc, start_ts, end_ts, etag, transparent, event_json) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                event["id"],
+                event.get("summary", "").lower(),
+                event_timestamp(event.get("start", {}), tz),
+                event_timestamp(event.get("end", {}), tz),
+                event.get("etag", ""),
+                int(event.get("transparency") == "transparent"),
+                json.dumps(event),
+            ),
+        )
+
+
+# -----------------------------------------
+# SYNC
+# -----------------------------------------
+def _sync(service, sync_token=None):
+    """Run a full sync (no token) or an incremental one; store the new token."""
+    settings = get_calendar_settings(service)
+    tz = get_timezone(settings)
+    page_token = None
+    changed = []
+    while True:
+        params = {
+            "calendarId": CALENDAR_ID,
+            "singleEvents": True,
+            "maxResults": 2500,
+            "timeZone": settings["timezone"],
+            "pageToken": page_token,
+            "fields": SYNC_FIELDS,
+        }
+        if sync_token:
+            params["syncToken"] = sync_token
+        response = service.events().list(**params).execute()
+        changed.extend(response.get("items", []))
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            break
+
+    with _connect() as conn:
+        if not sync_token:
+            conn.execute("DELETE FROM events")
+        _store_events(conn, changed, tz)
+        set_state(conn, sync_token=response["nextSyncToken"], synced_at=time.time())
+    return len(changed)
+
+
+def _full_sync(service):
+    count = _sync(service)
+    print(f"Calendar event store synced {count} events")
+
+
+# A syncToken Calendar no longer accepts returns 410 Gone.
+_syncer = Syncer(STORE_PATH, SCHEMA, "Calendar event store", "sync_token", _full_sync, _sync, (410,))
+
+
+def ensure_fresh(service, max_age=STORE_MAX_AGE):
+    """
+    Bring the store up to date if it is older than max_age seconds.
+
+    Returns:
+        bool: True when the store can answer queries right now.
+    """
+    creds = get_credentials(CALENDER_CREDENTIALS_PATH, CALENDER_SCOPES, authenticate_and_save)
+    return _syncer.ensure_fresh(service, credentials_fingerprint(creds), max_age)
+
+
+# -----------------------------------------
+# QUERIES AND LOCAL WRITES
+# -----------------------------------------
+def events_between(start_ts, end_ts, name=None):
+    """Stored events overlapping [start_ts, end_ts), optionally matching a name."""
+    sql = "SELECT event_json FROM events WHERE start_ts < ? AND end_ts > ?"
+    params = [end_ts, start_ts]
+    if name:
+        sql += " AND summary_lc LIKE ? ESCAPE '\\'"
+        # Match the name literally: % and _ in user text are not wildcards.
+        escaped = name.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params.append(f"%{escaped}%")
+    sql += " ORDER BY start_ts"
+    with _connect() as conn:
+        return [json.loads(row[0]) for row in conn.execute(sql, params)]
+
+
+def busy_intervals(start_ts, end_ts):
+    """(start, end) epoch pairs of opaque events overlapping the range."""
+    with _connect() as conn:
+        return conn.execute(
+            "SELECT start_ts, end_ts FROM events "
+            "WHERE start_ts < ? AND end_ts > ? AND transparent = 0 ORDER BY start_ts",
+            (end_ts, start_ts),
+        ).fetchall()
+
+
+def get_etag(event_id):
+    with _connect() as conn:
+        row = conn.execute("SELECT etag FROM events WHERE id = ?", (event_id,)).fetchone()
+    return row[0] if row else None
+
+
+def get_timezone_id(event_id):
+    """The timeZone stored on an indexed event's start, if any."""
+    with _connect() as conn:
+        row = conn.execute("SELECT event_json FROM events WHERE id = ?", (event_id,)).fetchone()
+    return json.loads(row[0]).get("start", {}).get("timeZone") if row else None
+
+
+def apply_event(service, event):
+    """Write an event returned by insert/update/patch into the store."""
+    if event.get("recurrence"):
+        # A recurring master stands for many instances; let the next sync expand it.
+        mark_stale()
+        return
+    tz = get_timezone(get_calendar_settings(service))
+    with _connect() as conn:
+        _store_events(conn, [event], tz)
+
+
+def remove_events(event_ids):
+    with _connect() as conn:
+        conn.executemany("DELETE FROM events WHERE id = ?", [(event_id,) for event_id in event_ids])
+
+
+def mark_stale():
+    with _connect() as conn:
+        set_state(conn, synced_at=0)
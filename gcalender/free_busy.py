@@ -0,0 +1,197 @@
+import datetime
+from bisect import bisect_right
+
+from gcalender.calendar_utils import get_client, get_calendar_user_email
+from gcalender.calendar_settings import get_calendar_settings, get_timezone
+
+# freebusy.query accepts at most 50 calendars per request
+MAX_CALENDARS = 50
+
+
+# -----------------------------------------
+# SORTED-INTERVAL SLOT FINDER
+# -----------------------------------------
+def merge_intervals(intervals):
+    """Merge overlapping (start, end) pairs into a sorted, disjoint list."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_gaps(busy, busy_ends, window_start, window_end, min_length):
+    """
+    Yield free (start, end) gaps of at least min_length inside a window.
+
+    busy must be merged (sorted and disjoint), so interval ends are sorted
+    too and bisect jumps straight to the first interval that can overlap.
+    """
+    cursor = window_start
+    for start, end in busy[bisect_right(busy_ends, window_start):]:
+        if start >= window_end:
+            break
+        if start - cursor >= min_length:
+            yield cursor, start
+        cursor = max(cursor, end)
+    if window_end - cursor >= min_length:
+        yield cursor, window_end
+
+
+def _parse_clock(value):
+    hours, minutes = value.split(":")
+    return datetime.time(int(hours), int(minutes))
+
+
+def candidate_windows(start, end, tz, working_hours=None):
+    """The windows to search: whole range, or working hours on working days."""
+    if not working_hours:
+        yield start, end
+        return
+    work_start = _parse_clock(working_hours["start"])
+    work_end = _parse_clock(working_hours["end"])
+    day = start.date()
+    while day <= end.date():
+        if day.weekday() in working_hours["days"]:
+            window_start = max(start, datetime.datetime.combine(day, work_start, tz))
+            window_end = min(end, datetime.datetime.combine(day, work_end, tz))
+            if window_end > window_start:
+                yield window_start, window_end
+        day += datetime.timedelta(days=1)
+
+
+def find_slots(busy, start, end, duration, tz, working_hours=None, max_slots=10):
+    """
+    Find free windows of at least duration between start and end.
+
+    Args:
+        busy (list): (start, end) aware datetimes from every calendar involved.
+        start / end (datetime): Aware search range.
+        duration (timedelta): Minimum slot length.
+        tz (tzinfo): Timezone the working hours are expressed in.
+        working_hours (dict): {"start": "HH:MM", "end": "HH:MM", "days": [0-6]} or None.
+        max_slots (int): Stop after this many windows.
+
+    Returns:
+        list: (start, end) datetime pairs.
+    """
+    merged = merge_intervals(busy)
+    busy_ends = [interval_end for _, interval_end in merged]
+    slots = []
+    for window_start, window_end in candidate_windows(start, end, tz, working_hours):
+        for slot in free_gaps(merged, busy_ends, window_start, window_end, duration):
+            slots.append(slot)
+            if len(slots) >= max_slots:
+                return slots
+    return slots
+
+
+# -----------------------------------------
+# TOOL
+# -----------------------------------------
+def _parse_rfc3339(value):
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def find_free_slots(
+    start_date: str,
+    days: int = 7,
+    duration_minutes: int = 30,
+    attendees: list[str] = None,
+    working_hours_only: bool = True,
+    max_slots: int = 10,
+) -> dict:
+    """
+    Find free time windows shared by the user and optional attendees.
+
+    Args:
+        start_date (str): First day to search in YYYY-MM-DD format. Empty string means from now.
+        days (int): Number of days to search.
+        duration_minutes (int): Minimum length of a free window.
+        attendees (list[str]): Other people's emails (or calendar ids) that must also be free.
+        working_hours_only (bool): Only search inside working hours on working days.
+        max_slots (int): Maximum number of windows to return.
+
+    Returns:
+        dict: Free windows or error details
+    """
+    try:
+        service = get_client()
+        if not service:
+            return {
+                "status": "error",
+                "message": "Failed to authenticate with Google Calendar. Please check credentials.",
+            }
+
+        settings = get_calendar_settings(service)
+        tz = get_timezone(settings)
+        now = datetime.datetime.now(tz)
+        if not start_date or start_date.strip() == "":
+            start = now
+        else:
+            try:
+                start = datetime.datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=tz)
+            except ValueError:
+                return {
+                    "status": "error",
+                    "message": f"Invalid date format: {start_date}. Use YYYY-MM-DD format.",
+                }
+            start = max(start, now)
+        if not days or days < 1:
+            days = 1
+        end = start.replace(hour=0, minute=0, second=0, microsecond=0) + datetime.timedelta(days=days)
+
+        me = get_calendar_user_email(service).lower()
+        calendar_ids = ["primary"] + [
+            a for a in dict.fromkeys(attendees or []) if a.lower() not in ("primary", me)
+        ]
+        if len(calendar_ids) > MAX_CALENDARS:
+            return {"status": "error", "message": f"At most {MAX_CALENDARS - 1} attendees are supported."}
+
+        response = service.freebusy().query(body={
+            "timeMin": start.isoformat(),
+            "timeMax": end.isoformat(),
+            "timeZone": settings["timezone"],
+            "items": [{"id": calendar_id} for calendar_id in calendar_ids],
+        }).execute()
+
+        busy = []
+        unavailable = []
+        for calendar_id, calendar in response.get("calendars", {}).items():
+            if calendar.get("errors"):
+                unavailable.append(calendar_id)
+                continue
+            busy.extend(
+                (_parse_rfc3339(b["start"]), _parse_rfc3339(b["end"]))
+                for b in calendar.get("busy", [])
+            )
+
+        slots = find_slots(
+            busy,
+            start,
+            end,
+            datetime.timedelta(minutes=max(1, duration_minutes)),
+            tz,
+            settings["working_hours"] if working_hours_only else None,
+            max_slots,
+        )
+
+        return {
+            "status": "success",
+            "message": f"Found {len(slots)} free window(s)." if slots else "No free windows found.",
+            "timezone": settings["timezone"],
+            "slots": [
+                {
+                    "start": slot_start.astimezone(tz).strftime("%Y-%m-%d %H:%M"),
+                    "end": slot_end.astimezone(tz).strftime("%Y-%m-%d %H:%M"),
+                }
+                for slot_start, slot_end in slots
+            ],
+            "unavailable_calendars": unavailable,
+        }
+
+    except Exception as e:
+        return {"status": "error", "message": f"Error finding free slots: {str(e)}"}
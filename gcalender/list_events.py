@@ -1,11 +1,91 @@
 import datetime
+from itertools import islice
 
 from gcalender.calendar_utils import format_event_time, get_client
+from gcalender.calendar_settings import get_calendar_settings, get_timezone
+from gcalender import event_store
+
+# Partial-response projections for events.list
+COMPACT_FIELDS = "nextPageToken,items(id,summary,start,end)"
+FULL_FIELDS = "nextPageToken,items(id,summary,start,end,location,description,attendees/email,htmlLink)"
+
+# events.list accepts up to 2500 per page
+PAGE_SIZE = 250
+
+
+def iter_events(service, calendar_id, time_min, time_max, fields=FULL_FIELDS,
+                time_zone=None, page_size=PAGE_SIZE, q=None):
+    """
+    Yield events in a time range, following nextPageToken lazily.
+
+    The next page is only requested once the caller has consumed the
+    current one, so stopping early (e.g. with islice) saves the calls.
+
+    Args:
+        service: Calendar API client.
+        calendar_id (str): Calendar to read, e.g. "primary".
+        time_min (str): RFC3339 lower bound (exclusive on end time).
+        time_max (str): RFC3339 upper bound (exclusive on start time).
+        fields (str): Partial-response projection, must include nextPageToken.
+        time_zone (str): IANA timezone for the returned times.
+        page_size (int): Events per API call.
+        q (str): Optional free-text filter applied by the Calendar API.
+
+    Yields:
+        dict: Raw event resources ordered by start time.
+    """
+    page_token = None
+    while True:
+        response = (
+            service.events()
+            .list(
+                calendarId=calendar_id,
+                timeMin=time_min,
+                timeMax=time_max,
+                maxResults=page_size,
+                singleEvents=True,
+                orderBy="startTime",
+                timeZone=time_zone,
+                pageToken=page_token,
+                fields=fields,
+                q=q,
+            )
+            .execute()
+        )
+        yield from response.get("items", [])
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return
+
+
+def format_event(event, compact=False):
+    """Reduce an event resource to the fields the calendar tools return."""
+    formatted_event = {
+        "id": event.get("id"),
+        "summary": event.get("summary", "Untitled Event"),
+        "start": format_event_time(event.get("start", {})),
+        "end": format_event_time(event.get("end", {})),
+    }
+    if compact:
+        return formatted_event
+    formatted_event.update({
+        "location": event.get("location", ""),
+        "description": event.get("description", ""),
+        "attendees": [
+            attendee.get("email")
+            for attendee in event.get("attendees", [])
+            if "email" in attendee
+        ],
+        "link": event.get("htmlLink", ""),
+    })
+    return formatted_event
 
 
 def list_events(
     start_date: str,
     days: int,
+    compact: bool = False,
+    max_results: int = 0,
 ) -> dict:
     """
     List upcoming calendar events within a specified date range.
@@ -13,6 +93,8 @@ def list_events(
     Args:
         start_date (str): Start date in YYYY-MM-DD format. If empty string, defaults to today.
         days (int): Number of days to look ahead. Use 1 for today only, 7 for a week, 30 for a month, etc.
+        compact (bool): Return only id, summary, start and end (recommended for long ranges).
+        max_results (int): Stop after this many events. 0 returns every event in the range.
 
     Returns:
         dict: Information about upcoming events or error details
@@ -30,18 +112,19 @@ def list_events(
                 "events": [],
             }
 
-        # Always use a large max_results value to return all events
-        max_results = 100
-
         # Always use primary calendar
         calendar_id = "primary"
 
+        # Dates are interpreted in the calendar's own timezone
+        settings = get_calendar_settings(service)
+        tz = get_timezone(settings)
+
         # Set time range
         if not start_date or start_date.strip() == "":
-            start_time = datetime.datetime.utcnow()
+            start_time = datetime.datetime.now(tz)
         else:
             try:
-                start_time = datetime.datetime.strptime(start_date, "%Y-%m-%d")
+                start_time = datetime.datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=tz)
             except ValueError:
                 return {
                     "status": "error",
@@ -56,51 +139,35 @@ def list_events(
         end_time = start_time + datetime.timedelta(days=days)
 
         # Format times for API call
-        time_min = start_time.isoformat() + "Z"
-        time_max = end_time.isoformat() + "Z"
+        time_min = start_time.isoformat()
+        time_max = end_time.isoformat()
 
-        # Call the Calendar API
-        events_result = (
-            service.events()
-            .list(
-                calendarId=calendar_id,
-                timeMin=time_min,
-                timeMax=time_max,
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy="startTime",
+        # Answer from the local event store, or call the Calendar API page by page
+        if event_store.ensure_fresh(service):
+            events = event_store.events_between(start_time.timestamp(), end_time.timestamp())
+        else:
+            events = iter_events(
+                service,
+                calendar_id,
+                time_min,
+                time_max,
+                fields=COMPACT_FIELDS if compact else FULL_FIELDS,
+                time_zone=settings["timezone"],
+                page_size=min(PAGE_SIZE, max_results) if max_results and max_results > 0 else PAGE_SIZE,
             )
-            .execute()
-        )
+        if max_results and max_results > 0:
+            events = islice(events, max_results)
 
-        events = events_result.get("items", [])
+        # Format events for display
+        formatted_events = [format_event(event, compact) for event in events]
 
-        if not events:
+        if not formatted_events:
             return {
                 "status": "success",
                 "message": "No upcoming events found.",
                 "events": [],
             }
 
-        # Format events for display
-        formatted_events = []
-        for event in events:
-            formatted_event = {
-                "id": event.get("id"),
-                "summary": event.get("summary", "Untitled Event"),
-                "start": format_event_time(event.get("start", {})),
-                "end": format_event_time(event.get("end", {})),
-                "location": event.get("location", ""),
-                "description": event.get("description", ""),
-                "attendees": [
-                    attendee.get("email")
-                    for attendee in event.get("attendees", [])
-                    if "email" in attendee
-                ],
-                "link": event.get("htmlLink", ""),
-            }
-            formatted_events.append(formatted_event)
-
         return {
             "status": "success",
             "message": f"Found {len(formatted_events)} event(s).",
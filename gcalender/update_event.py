@@ -1,4 +1,8 @@
+from googleapiclient.errors import HttpError
+
 from gcalender.calendar_utils import get_client, parse_datetime
+from gcalender.calendar_settings import get_calendar_settings
+from gcalender import event_store
 
 
 def update_event(
@@ -31,25 +35,13 @@ def update_event(
         # Always use primary calendar
         calendar_id = "primary"
 
-        # First get the existing event
-        try:
-            event = (
-                service.events().get(calendarId=calendar_id, eventId=event_id).execute()
-            )
-        except Exception:
-            return {
-                "status": "error",
-                "message": f"Event with ID {event_id} not found in primary calendar.",
-            }
-
-        # Update the event with new values
+        # Only the changed fields are sent; nothing is read back first
+        body = {}
         if summary:
-            event["summary"] = summary
+            body["summary"] = summary
 
-        # Get timezone from the original event
-        timezone_id = "Asia/Dhaka"  # Default
-        if "start" in event and "timeZone" in event["start"]:
-            timezone_id = event["start"]["timeZone"]
+        # Keep the event's own timezone when the local index knows it
+        timezone_id = event_store.get_timezone_id(event_id) or get_calendar_settings(service)["timezone"]
 
         # Update start time if provided
         if start_time:
@@ -59,7 +51,8 @@ def update_event(
                     "status": "error",
                     "message": "Invalid start time format. Please use YYYY-MM-DD HH:MM format.",
                 }
-            event["start"] = {"dateTime": start_dt.isoformat(), "timeZone": timezone_id}
+            # PATCH merges nested objects: clear "date" so an all-day event becomes timed
+            body["start"] = {"date": None, "dateTime": start_dt.isoformat(), "timeZone": timezone_id}
 
         # Update end time if provided
         if end_time:
@@ -69,14 +62,39 @@ def update_event(
                     "status": "error",
                     "message": "Invalid end time format. Please use YYYY-MM-DD HH:MM format.",
                 }
-            event["end"] = {"dateTime": end_dt.isoformat(), "timeZone": timezone_id}
+            body["end"] = {"date": None, "dateTime": end_dt.isoformat(), "timeZone": timezone_id}
 
-        # Update the event
-        updated_event = (
-            service.events()
-            .update(calendarId=calendar_id, eventId=event_id, body=event)
-            .execute()
+        if not body:
+            return {"status": "error", "message": "Nothing to update."}
+
+        request = service.events().patch(
+            calendarId=calendar_id,
+            eventId=event_id,
+            body=body,
+            fields=event_store.EVENT_FIELDS,
         )
+        # Refuse to overwrite a change made elsewhere since the event was last synced
+        etag = event_store.get_etag(event_id)
+        if etag:
+            request.headers["If-Match"] = etag
+
+        try:
+            updated_event = request.execute()
+        except HttpError as e:
+            if e.resp.status == 404:
+                return {
+                    "status": "error",
+                    "message": f"Event with ID {event_id} not found in primary calendar.",
+                }
+            if e.resp.status == 412:
+                event_store.mark_stale()
+                return {
+                    "status": "error",
+                    "message": "The event was changed elsewhere since it was last read. "
+                               "List the events again and retry the update.",
+                }
+            raise
+        event_store.apply_event(service, updated_event)
 
         return {
             "status": "success",
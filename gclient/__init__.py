@@ -0,0 +1,5 @@
+from .pool import get_credentials, get_service, invalidate
+from .batch import execute_batch
+from .aio import execute, run_blocking
+from .identity import get_user_email
+from .drive_store import DriveStore
@@ -0,0 +1,34 @@
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# -----------------------------------------
+# ASYNC EXECUTION LAYER
+# -----------------------------------------
+# googleapiclient is blocking. Async tools hand their API calls to a
+# bounded pool so a slow Google call never stalls the event loop that
+# serves every other ADK session. Pooled clients use one keep-alive
+# connection per worker thread (see gclient.pool).
+
+MAX_WORKERS = int(os.getenv("GOOGLE_API_MAX_WORKERS", "16"))
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="google-api")
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking callable on the shared Google API executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+async def execute(build_request, num_retries=0):
+    """
+    Build and execute an HttpRequest on the executor without blocking the event loop.
+
+    googleapiclient binds a request to an http object when the request is
+    built, so build_request is a zero-argument callable (usually a lambda
+    around client.users()...send(...)) that runs on the worker thread and
+    picks up that thread's own connection.
+    """
+    return await run_blocking(lambda: build_request().execute(num_retries=num_retries))
@@ -0,0 +1,35 @@
+# -----------------------------------------
+# HTTP BATCH EXECUTION
+# -----------------------------------------
+# Google recommends at most 50 calls per batch; larger batches are more
+# likely to be rate limited as a whole.
+BATCH_LIMIT = 50
+
+
+def execute_batch(client, requests, chunk_size=BATCH_LIMIT):
+    """
+    Execute API requests as HTTP batch calls instead of one round trip each.
+
+    Args:
+        client: The discovery client the requests were built from.
+        requests (list): HttpRequest objects (not yet executed).
+        chunk_size (int): Maximum number of requests per batch call.
+
+    Returns:
+        list: One (response, exception) tuple per request, in input order.
+        A request the batch response never answered gets a RuntimeError.
+    """
+    results = [None] * len(requests)
+
+    def callback(request_id, response, exception):
+        results[int(request_id)] = (response, exception)
+
+    for offset in range(0, len(requests), chunk_size):
+        batch = client.new_batch_http_request(callback=callback)
+        for index, request in enumerate(requests[offset:offset + chunk_size], offset):
+            batch.add(request, request_id=str(index))
+        batch.execute()
+    return [
+        result if result is not None else (None, RuntimeError("No response for this request in the batch"))
+        for result in results
+    ]
@@ -0,0 +1,278 @@
+import os
+import json
+import time
+import threading
+
+from .pool import get_credentials
+from .identity import credentials_fingerprint
+from .local_db import Syncer, connect, delete_state, get_state, set_state
+
+# -----------------------------------------
+# DRIVE METADATA STORE
+# -----------------------------------------
+# File metadata (name, mimeType, parents, modifiedTime, size, checksum,
+# permissions) for every non-trashed file is kept in SQLite and brought
+# up to date with the Drive changes feed (changes.list from the stored
+# page token). A background poller applies the feed every POLL_INTERVAL
+# seconds so listings, title lookups and permission checks are answered
+# locally; callers fall back to files.list while a store is bootstrapping.
+
+STORE_MAX_AGE = int(os.getenv("DRIVE_STORE_MAX_AGE", "60"))
+POLL_INTERVAL = int(os.getenv("DRIVE_POLL_INTERVAL", "60"))  # 0 disables the poller
+
+FOLDER_MIME = "application/vnd.google-apps.folder"
+FILE_FIELDS = (
+    "id,name,mimeType,parents,modifiedTime,size,md5Checksum,trashed,"
+    "permissions(id,type,role,emailAddress)"
+)
+LIST_FIELDS = f"nextPageToken,files({FILE_FIELDS})"
+CHANGE_FIELDS = f"nextPageToken,newStartPageToken,changes(fileId,removed,file({FILE_FIELDS}))"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    name_lc TEXT,
+    mime_type TEXT,
+    modified_time TEXT,
+    size INTEGER,
+    md5 TEXT,
+    permissions TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_files_modified ON files(modified_time DESC);
+CREATE INDEX IF NOT EXISTS idx_files_mime ON files(mime_type, modified_time DESC);
+CREATE TABLE IF NOT EXISTS file_parents (
+    parent_id TEXT,
+    file_id TEXT,
+    PRIMARY KEY (parent_id, file_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_file_parents_file ON file_parents(file_id);
+"""
+
+COLUMNS = "id, name, mime_type, modified_time, size, md5, permissions"
+
+
+def _row_to_file(row, parents=None):
+    file = {
+        "id": row[0],
+        "name": row[1],
+        "mimeType": row[2],
+        "modifiedTime": row[3],
+        "size": row[4],
+        "md5Checksum": row[5],
+        "permissions": json.loads(row[6]) if row[6] else None,
+    }
+    if parents is not None:
+        file["parents"] = parents
+    return file
+
+
+class DriveStore:
+    """
+    Local Drive metadata for one credential file.
+
+    Args:
+        path (str): SQLite file backing the store.
+        credentials_path / scopes / authenticate: As for gclient.get_service.
+        get_client (callable): Returns the pooled Drive v3 client.
+    """
+
+    def __init__(self, path, credentials_path, scopes, authenticate, get_client):
+        self.path = path
+        self.credentials_path = credentials_path
+        self.scopes = scopes
+        self.authenticate = authenticate
+        self.get_client = get_client
+        # Bumped after every committed write in this process, so in-memory views know when to rebuild.
+        self.version = 0
+        # A page token Drive no longer knows returns 404 or 410. Other errors (a 400 from a
+        # malformed call, say) keep the token so the index is not rebuilt for nothing.
+        self._syncer = Syncer(
+            path, SCHEMA, "Drive store", "page_token", self._bootstrap, self._sync_changes, (404, 410)
+        )
+        self._state_lock = threading.Lock()
+        self._poller = None
+
+    def _connect(self):
+        return connect(self.path, SCHEMA)
+
+    def _store_files(self, conn, files):
+        for file in files:
+            conn.execute(
+                f"INSERT OR REPLACE INTO files ({COLUMNS}, name_lc) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    file["id"],
+                    file.get("name", ""),
+                    file.get("mimeType", ""),
+                    file.get("modifiedTime", ""),
+                    int(file["size"]) if file.get("size") else None,
+                    file.get("md5Checksum"),
+                    json.dumps(file["permissions"]) if "permissions" in file else None,
+                    file.get("name", "").casefold(),
+                ),
+            )
+            conn.execute("DELETE FROM file_parents WHERE file_id = ?", (file["id"],))
+            conn.executemany(
+                "INSERT OR IGNORE INTO file_parents (parent_id, file_id) VALUES (?, ?)",
+                [(parent_id, file["id"]) for parent_id in file.get("parents", [])],
+            )
+
+    def _delete_files(self, conn, file_ids):
+        params = [(file_id,) for file_id in file_ids]
+        conn.executemany("DELETE FROM files WHERE id = ?", params)
+        conn.executemany("DELETE FROM file_parents WHERE file_id = ?", params)
+
+    # -----------------------------------------
+    # SYNC
+    # -----------------------------------------
+    def _bootstrap(self, drive):
+        """Rebuild the store from files.list."""
+        # Take the page token first so nothing that changes during the listing is lost.
+        page_token = drive.changes().getStartPageToken().execute()["startPageToken"]
+        files = []
+        cursor = None
+        while True:
+            response = drive.files().list(
+                q="trashed = false", fields=LIST_FIELDS, pageSize=1000, pageToken=cursor
+            ).execute()
+            files.extend(response.get("files", []))
+            cursor = response.get("nextPageToken")
+            if not cursor:
+                break
+        with self._connect() as conn:
+            conn.execute("DELETE FROM files")
+            conn.execute("DELETE FROM file_parents")
+            delete_state(conn, "root_id")
+            self._store_files(conn, files)
+            set_state(conn, page_token=page_token, synced_at=time.time())
+        self.version += 1
+        print(f"Drive store {os.path.basename(self.path)} bootstrapped with {len(files)} files")
+
+    def _sync_changes(self, drive, page_token):
+        """Apply changes.list entries since page_token."""
+        changed = {}  # file id -> metadata, or None when removed or trashed
+        while True:
+            response = drive.changes().list(
+                pageToken=page_token, fields=CHANGE_FIELDS, pageSize=1000, spaces="drive"
+            ).execute()
+            for change in response.get("changes", []):
+                file = change.get("file")
+                gone = change.get("removed") or not file or file.get("trashed")
+                changed[change["fileId"]] = None if gone else file
+            if "newStartPageToken" in response:
+                page_token = response["newStartPageToken"]
+                break
+            page_token = response["nextPageToken"]
+
+        with self._connect() as conn:
+            if changed:
+                self._delete_files(conn, [file_id for file_id, file in changed.items() if file is None])
+                self._store_files(conn, [file for file in changed.values() if file is not None])
+            set_state(conn, page_token=page_token, synced_at=time.time())
+        if changed:
+            self.version += 1
+        return len(changed)
+
+    def ensure_fresh(self, drive=None, max_age=STORE_MAX_AGE):
+        """
+        Bring the store up to date if it is older than max_age seconds.
+
+        Returns:
+            bool: True when the store can answer queries right now.
+        """
+        self.start_polling()
+        drive = drive or self.get_client()
+        creds = get_credentials(self.credentials_path, self.scopes, self.authenticate)
+        return self._syncer.ensure_fresh(drive, credentials_fingerprint(creds), max_age)
+
+    def start_polling(self, interval=POLL_INTERVAL):
+        """Start the background change-feed poller (once per store)."""
+        if interval <= 0 or self._poller is not None:
+            return
+        with self._state_lock:
+            if self._poller is not None:
+                return
+
+            def poll():
+                while True:
+                    time.sleep(interval)
+                    try:
+                        self.ensure_fresh(max_age=interval / 2)
+                    except Exception as e:
+                        print(f"Drive store poll failed: {e}")
+
+            self._poller = threading.Thread(target=poll, daemon=True)
+            self._poller.start()
+
+    # -----------------------------------------
+    # QUERIES AND LOCAL WRITES
+    # -----------------------------------------
+    def query(self, mime_type=None, name_contains=None, parent_id=None, limit=100, offset=0):
+        """Stored files matching every given filter, newest first."""
+        sql = f"SELECT {COLUMNS} FROM files"
+        where = []
+        params = []
+        if mime_type:
+            where.append("mime_type = ?")
+            params.append(mime_type)
+        if name_contains:
+            where.append("instr(name_lc, ?) > 0")
+            params.append(name_contains.casefold())
+        if parent_id:
+            where.append("id IN (SELECT file_id FROM file_parents WHERE parent_id = ?)")
+            params.append(parent_id)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY modified_time DESC LIMIT ? OFFSET ?"
+        with self._connect() as conn:
+            rows = conn.execute(sql, params + [limit, offset]).fetchall()
+        return [_row_to_file(row) for row in rows]
+
+    def get(self, file_id):
+        """One stored file with its parents, or None."""
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {COLUMNS} FROM files WHERE id = ?", (file_id,)).fetchone()
+            if row is None:
+                return None
+            parents = [
+                r[0] for r in conn.execute("SELECT parent_id FROM file_parents WHERE file_id = ?", (file_id,))
+            ]
+        return _row_to_file(row, parents)
+
+    def root_id(self, drive):
+        """The real id of "My Drive" (stored parents never use the 'root' alias)."""
+        with self._connect() as conn:
+            root = get_state(conn, "root_id")
+        if root is None:
+            root = drive.files().get(fileId="root", fields="id").execute()["id"]
+            with self._connect() as conn:
+                set_state(conn, root_id=root)
+        return root
+
+    def upsert(self, file):
+        """Record a file created or changed through the API before the next sync sees it."""
+        with self._connect() as conn:
+            self._store_files(conn, [file])
+        self.version += 1
+
+    def remove(self, file_id):
+        with self._connect() as conn:
+            self._delete_files(conn, [file_id])
+        self.version += 1
+
+    def refresh_file(self, drive, file_id):
+        """
+        Re-read one file's metadata (e.g. after a sharing change) into the store.
+
+        Failures are logged, not raised: the change feed catches up anyway.
+        """
+        try:
+            file = drive.files().get(fileId=file_id, fields=FILE_FIELDS).execute()
+        except Exception as e:
+            print(f"Drive store refresh of {file_id} failed: {e}")
+            return None
+        if file.get("trashed"):
+            self.remove(file_id)
+        else:
+            self.upsert(file)
+        return file
@@ -0,0 +1,51 @@
+import os
+import time
+import hashlib
+import threading
+
+# -----------------------------------------
+# AUTHENTICATED USER IDENTITY CACHE
+# -----------------------------------------
+# The signed-in account's email is looked up once per credential and kept
+# for IDENTITY_TTL seconds. Entries are keyed by a fingerprint of the
+# OAuth client id and refresh token, so a new login never sees the
+# previous account's address.
+
+IDENTITY_TTL = int(os.getenv("GOOGLE_IDENTITY_TTL", "3600"))
+
+_lock = threading.Lock()
+_identities = {}  # fingerprint -> (email, expires_at)
+
+
+def credentials_fingerprint(creds):
+    raw = f"{creds.client_id}:{creds.refresh_token or creds.token}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get_user_email(creds, fetch, ttl=IDENTITY_TTL):
+    """
+    Return the account email for creds, calling fetch() only on a cache miss.
+
+    Args:
+        creds (Credentials): The credentials the lookup is made with.
+        fetch (callable): Returns the email address from the API.
+        ttl (int): Seconds before the address is looked up again.
+
+    Returns:
+        str: The authenticated user's email address.
+    """
+    key = credentials_fingerprint(creds)
+    with _lock:
+        entry = _identities.get(key)
+        if entry and entry[1] > time.time():
+            return entry[0]
+
+    email = fetch()
+    with _lock:
+        _identities[key] = (email, time.time() + ttl)
+    return email
+
+
+def clear_identities():
+    with _lock:
+        _identities.clear()
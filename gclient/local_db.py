@@ -0,0 +1,154 @@
+import os
+import time
+import sqlite3
+import pathlib
+import threading
+from contextlib import contextmanager
+
+from googleapiclient.errors import HttpError
+
+# -----------------------------------------
+# LOCAL SQLITE STORES
+# -----------------------------------------
+# Shared plumbing for the on-disk caches (Gmail mirror, calendar events,
+# Drive metadata): one short-lived connection per operation, WAL mode so
+# readers never wait on a sync, and a key/value state table for sync
+# tokens and timestamps. Syncer holds the freshness logic the stores
+# share: a background bootstrap, incremental syncs under a lock, and a
+# rebuild when the sync cursor expires or the credentials change.
+
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_ready = set()
+_ready_lock = threading.Lock()
+
+
+@contextmanager
+def connect(path, schema):
+    """Open a store, creating its schema on first use; commit on success."""
+    if path not in _ready:
+        pathlib.Path(os.path.dirname(path)).mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        if path not in _ready:
+            with _ready_lock:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(schema + STATE_SCHEMA)
+                _ready.add(path)
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def get_state(conn, key, default=None):
+    row = conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+
+def set_state(conn, **values):
+    conn.executemany(
+        "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+        [(key, str(value)) for key, value in values.items()],
+    )
+
+
+def delete_state(conn, *keys):
+    conn.executemany("DELETE FROM state WHERE key = ?", [(key,) for key in keys])
+
+
+class Syncer:
+    """
+    Keeps one store in sync: bootstrap once, then incremental syncs.
+
+    Args:
+        path / schema: As for connect.
+        name (str): Store name for log messages.
+        token_key (str): State key of the incremental sync cursor.
+        bootstrap (callable): bootstrap(client) rebuilds the store and saves the cursor and synced_at.
+        sync (callable): sync(client, token) applies changes since token and saves the next cursor and synced_at.
+        expired_statuses (tuple): HTTP statuses meaning the cursor is no longer valid.
+    """
+
+    def __init__(self, path, schema, name, token_key, bootstrap, sync, expired_statuses):
+        self.path = path
+        self.schema = schema
+        self.name = name
+        self.token_key = token_key
+        self.bootstrap = bootstrap
+        self.sync = sync
+        self.expired_statuses = expired_statuses
+        self._sync_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._bootstrap_thread = None
+
+    def _read_state(self):
+        with connect(self.path, self.schema) as conn:
+            return (
+                get_state(conn, self.token_key),
+                float(get_state(conn, "synced_at", 0)),
+                get_state(conn, "fingerprint"),
+            )
+
+    def _run_bootstrap(self, client, fingerprint):
+        try:
+            with self._sync_lock:
+                self.bootstrap(client)
+                with connect(self.path, self.schema) as conn:
+                    set_state(conn, fingerprint=fingerprint)
+        except Exception as e:
+            print(f"{self.name} bootstrap failed: {e}")
+        finally:
+            self._bootstrap_thread = None
+
+    def ensure_fresh(self, client, fingerprint, max_age):
+        """
+        Bring the store up to date if it is older than max_age seconds.
+
+        A store built for other credentials (fingerprint, see
+        gclient.identity.credentials_fingerprint) is rebuilt from scratch.
+
+        Returns:
+            bool: True when the store can answer queries right now.
+        """
+        token, synced_at, stored_fingerprint = self._read_state()
+
+        if token is None or stored_fingerprint != fingerprint:
+            # A bootstrap can take many calls; run it in the background and
+            # let this call go live.
+            with self._state_lock:
+                if self._bootstrap_thread is None:
+                    self._bootstrap_thread = threading.Thread(
+                        target=self._run_bootstrap, args=(client, fingerprint), daemon=True
+                    )
+                    self._bootstrap_thread.start()
+            return False
+
+        if time.time() - synced_at <= max_age:
+            return True
+
+        with self._sync_lock:
+            # Another session may have synced while this one waited.
+            token, synced_at, _ = self._read_state()
+            if token is None:
+                return False
+            if time.time() - synced_at <= max_age:
+                return True
+            try:
+                self.sync(client, token)
+            except HttpError as e:
+                if e.resp.status in self.expired_statuses:
+                    # Cursor no longer valid: the next call bootstraps again.
+                    with connect(self.path, self.schema) as conn:
+                        delete_state(conn, self.token_key)
+                print(f"{self.name} sync failed: {e}")
+                return False
+            except Exception as e:
+                print(f"{self.name} sync failed: {e}")
+                return False
+        return True
@@ -0,0 +1,140 @@
+import os
+import threading
+
+import httplib2
+import google_auth_httplib2
+from google.oauth2.credentials import Credentials
+from google.auth.transport.requests import Request
+from googleapiclient.discovery import build
+from googleapiclient.http import HttpRequest
+
+from .identity import clear_identities
+
+# -----------------------------------------
+# SHARED GOOGLE API CLIENT POOL
+# -----------------------------------------
+# Every agent used to re-read its token file and call discovery.build()
+# on each tool call. The pool keeps one Credentials object per token file
+# and one discovery client per (service, version, scopes, token file).
+# HTTP connections are kept per thread, because httplib2.Http is not
+# thread-safe, so each worker thread reuses its own keep-alive socket.
+
+HTTP_TIMEOUT = 60
+
+_lock = threading.RLock()
+_file_locks = {}   # credentials_path -> RLock held during that token file's login or refresh
+_credentials = {}  # (credentials_path, scopes) -> [mtime, Credentials]
+_services = {}     # (service, version, credentials_path, scopes) -> (Credentials, client)
+_local = threading.local()
+
+
+def _scope_key(scopes):
+    return tuple(sorted(scopes))
+
+
+def _file_lock(credentials_path):
+    with _lock:
+        return _file_locks.setdefault(credentials_path, threading.RLock())
+
+
+def _save_credentials(credentials_path, creds):
+    with open(credentials_path, "w") as f:
+        f.write(creds.to_json())
+
+
+def get_credentials(credentials_path, scopes, authenticate=None):
+    """
+    Return the shared Credentials for a token file, refreshing them in place.
+
+    Args:
+        credentials_path (str): Path of the authorized-user token JSON.
+        scopes (list): OAuth scopes the token was granted for.
+        authenticate (callable): Runs the OAuth flow when the token file is missing.
+
+    Returns:
+        Credentials: A valid credentials object shared by every caller.
+    """
+    key = (credentials_path, _scope_key(scopes))
+    # The OAuth flow and token refresh hold only this token file's lock, so
+    # clients for other token files stay available meanwhile.
+    with _file_lock(credentials_path):
+        if authenticate and not os.path.exists(credentials_path):
+            authenticate()
+
+        # Reload only when the token file was replaced (e.g. a fresh login).
+        mtime = os.path.getmtime(credentials_path)
+        with _lock:
+            entry = _credentials.get(key)
+            if entry is None or entry[0] != mtime:
+                entry = [mtime, Credentials.from_authorized_user_file(credentials_path, scopes)]
+                _credentials[key] = entry
+
+        creds = entry[1]
+        if not creds.valid and creds.refresh_token:
+            creds.refresh(Request())
+            _save_credentials(credentials_path, creds)
+            entry[0] = os.path.getmtime(credentials_path)
+        return creds
+
+
+def _thread_http(creds):
+    """Return this thread's keep-alive AuthorizedHttp for the given credentials."""
+    pool = getattr(_local, "http", None)
+    if pool is None:
+        pool = _local.http = {}
+    entry = pool.get(id(creds))
+    if entry is None or entry[0] is not creds:
+        authed = google_auth_httplib2.AuthorizedHttp(
+            creds, http=httplib2.Http(timeout=HTTP_TIMEOUT)
+        )
+        entry = (creds, authed)
+        pool[id(creds)] = entry
+    return entry[1]
+
+
+def _request_builder(creds):
+    def build_request(http, *args, **kwargs):
+        # Ignore the client's shared http object and use the calling thread's.
+        return HttpRequest(_thread_http(creds), *args, **kwargs)
+    return build_request
+
+
+def get_service(service, version, scopes, credentials_path, authenticate=None):
+    """
+    Return a warm, thread-safe discovery client from the shared pool.
+
+    Args:
+        service (str): API name, e.g. "gmail" or "calendar".
+        version (str): API version, e.g. "v1".
+        scopes (list): OAuth scopes for the client.
+        credentials_path (str): Path of the authorized-user token JSON.
+        authenticate (callable): Runs the OAuth flow when the token file is missing.
+
+    Returns:
+        Resource: A googleapiclient resource bound to the shared credentials.
+    """
+    creds = get_credentials(credentials_path, scopes, authenticate)
+    key = (service, version, credentials_path, _scope_key(scopes))
+    with _lock:
+        entry = _services.get(key)
+        if entry is None or entry[0] is not creds:
+            client = build(
+                service,
+                version,
+                http=_thread_http(creds),
+                requestBuilder=_request_builder(creds),
+                cache_discovery=False,
+            )
+            entry = (creds, client)
+            _services[key] = entry
+        return entry[1]
+
+
+def invalidate(credentials_path=None):
+    """Drop pooled credentials and clients (all of them, or one token file's)."""
+    with _lock:
+        for key in [k for k in _credentials if credentials_path in (None, k[0])]:
+            del _credentials[key]
+        for key in [k for k in _services if credentials_path in (None, k[2])]:
+            del _services[key]
+    clear_identities()
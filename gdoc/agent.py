@@ -7,6 +7,7 @@ from google.adk.sessions import InMemorySessionService
 from gdoc.list_doc import list_my_google_docs, find_document_by_title
 from gdoc.share_doc import share_google_doc, get_doc_permissions, update_doc_permission
 from gdoc.doc_creation import resolve_ambiguity, docs_operation, create_google_doc
+from gdoc.doc_editing import docs_batch_edit
 from gdoc.doc_deletion import delete_google_doc
 # # ============================================================
 # # GEMINI RETRY POLICY
@@ -40,6 +41,9 @@ def gdocs_agent():
         - CREATE new docs: create_google_doc (returns ID)
         - DELETE docs by title OR "the one you just created": find_document_by_title → delete_google_doc
         - READ/WRITE/DELETE content: docs_operation
+          (long docs are read in chunks: continue with the start_index the read returns)
+        - MULTI-STEP edits (headings, bullets, tables, styling, replace): docs_batch_edit
+          with all operations in one call, using indices and the revision from the last read
         - SHARE docs by email: share_google_doc
         - VIEW permissions: get_doc_permissions
         - UPDATE permissions: update_doc_permission
@@ -70,6 +74,7 @@ def gdocs_agent():
             find_document_by_title,
             resolve_ambiguity,
             docs_operation,
+            docs_batch_edit,
             create_google_doc,
             delete_google_doc,
             share_google_doc, get_doc_permissions, update_doc_permission
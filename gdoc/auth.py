@@ -1,9 +1,10 @@
 import os
 import pathlib
-from google.oauth2.credentials import Credentials
+from functools import partial
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+
+from gclient import DriveStore, get_service
 
 KEYFILE_PATH = os.getcwd() + "/gdoc/credentials/oauth.keys.json"
 GDRIVE_CREDENTIALS_PATH = os.getcwd() + "/gdoc/credentials/.gdrive-server-credentials.json"
@@ -15,14 +16,10 @@ SCOPES = [
 ]
 
 def get_docs_service():
-    authenticate_and_save("docs")
-    creds = Credentials.from_authorized_user_file(GDOC_CREDENTIALS_PATH, SCOPES)
-    return build('docs', 'v1', credentials=creds)
+    return get_service("docs", "v1", SCOPES, GDOC_CREDENTIALS_PATH, partial(authenticate_and_save, "docs"))
 
 def get_drive_service():
-    authenticate_and_save("drive")
-    creds = Credentials.from_authorized_user_file(GDRIVE_CREDENTIALS_PATH, DRIVE_SCOPES)
-    return build("drive", "v3", credentials=creds)
+    return get_service("drive", "v3", DRIVE_SCOPES, GDRIVE_CREDENTIALS_PATH, partial(authenticate_and_save, "drive"))
 
 def authenticate_and_save(app: str = "drive"):
     
@@ -67,3 +64,13 @@ def authenticate_and_save(app: str = "drive"):
         with open(GDOC_CREDENTIALS_PATH, "w") as f:
             f.write(creds.to_json())
         print(f"Credentials saved to {GDOC_CREDENTIALS_PATH}")
+
+
+# Local Drive metadata (docs index, permissions), kept current by the changes feed
+DRIVE_STORE = DriveStore(
+    os.getcwd() + "/gdoc/credentials/.drive-store.sqlite3",
+    GDRIVE_CREDENTIALS_PATH,
+    DRIVE_SCOPES,
+    partial(authenticate_and_save, "drive"),
+    get_drive_service,
+)
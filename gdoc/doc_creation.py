@@ -1,4 +1,9 @@
 from gdoc.auth import get_docs_service, get_drive_service
+from gclient.drive_store import FILE_FIELDS
+from gdoc import doc_index
+from gdoc.doc_reader import DEFAULT_READ_CHARS, read_range, section_text
+
+READ_FIELDS = "revisionId,body,headers,footers"
 
 def resolve_ambiguity(choice: str, tool_context=None) -> str:
     """
@@ -35,7 +40,8 @@ def resolve_ambiguity(choice: str, tool_context=None) -> str:
     return "I couldn't match that choice. Please reply with a number or more of the title."
 
 def docs_operation(operation: str, document_id: str, content: str = None,
-                   start_index: int = None, end_index: int = None, tool_context=None) -> str:
+                   start_index: int = None, end_index: int = None,
+                   max_chars: int = DEFAULT_READ_CHARS, tool_context=None) -> str:
     """
     Read, write, or delete content in a Google Doc.
     
@@ -43,7 +49,8 @@ def docs_operation(operation: str, document_id: str, content: str = None,
         operation: 'read', 'write', or 'delete'.
         document_id: The doc ID.
         content: Text for write (optional).
-        start_index/end_index: For delete/update (optional).
+        start_index/end_index: For delete/update, or the index range to read (optional).
+        max_chars: Size of each chunk returned by read.
         tool_context: ADK-injected context.
     
     Returns:
@@ -52,16 +59,28 @@ def docs_operation(operation: str, document_id: str, content: str = None,
     service = get_docs_service()
 
     if operation == "read":
-        doc = service.documents().get(documentId=document_id).execute()
-        paragraphs = [elem for elem in doc.get('body', {}).get('content', []) if 'paragraph' in elem]
-        text = ""
-        for p in paragraphs:
-            for elem in p.get('paragraph', {}).get('elements', []):
-                tr = elem.get('textRun', {})
-                if tr.get('content'):
-                    text += tr['content']
-        preview = text.replace('\n', ' ')[:1000]
-        return f"Document content preview:\n{preview}" + ("\n..." if len(text) > 1000 else "")
+        doc = service.documents().get(documentId=document_id, fields=READ_FIELDS).execute()
+        chunk = read_range(doc, start_index, end_index, max_chars)
+        parts = []
+        if not start_index:
+            header = section_text(doc, "headers")
+            if header:
+                parts.append(f"[Header] {header}\n")
+        parts.append(chunk["text"])
+        if chunk["next_index"] is None and not end_index:
+            footer = section_text(doc, "footers")
+            if footer:
+                parts.append(f"\n[Footer] {footer}")
+        message = (
+            f"Document content (indices {chunk['start_index']}-{chunk['end_index']} "
+            f"of {chunk['document_end']}, revision {chunk['revision_id']}):\n" + "".join(parts)
+        )
+        if chunk["next_index"] is not None:
+            message += (
+                f"\n... more content. Continue with docs_operation('read', '{document_id}', "
+                f"start_index={chunk['next_index']})"
+            )
+        return message
 
     elif operation == "write" and content:
         requests = [{
@@ -101,6 +120,7 @@ def create_google_doc(title: str, tool_context=None) -> str:
         'name': title,
         'mimeType': 'application/vnd.google-apps.document'
     }
-    file = drive.files().create(body=file_metadata, fields='id').execute()
+    file = drive.files().create(body=file_metadata, fields=FILE_FIELDS).execute()
     doc_id = file.get('id')
+    doc_index.upsert_doc(file)
     return f"Created new Google Doc: '{title}' → ID: {doc_id}"
\ No newline at end of file
@@ -1,4 +1,6 @@
 from gdoc.auth import get_drive_service
+from gdoc import doc_index
+
 def delete_google_doc(document_id: str, tool_context=None) -> str:
     """
     Delete a Google Docs file by its document ID.
@@ -13,6 +15,7 @@ def delete_google_doc(document_id: str, tool_context=None) -> str:
     drive = get_drive_service()
     try:
         drive.files().delete(fileId=document_id).execute()
+        doc_index.remove_doc(document_id)
         return f"Deleted document with ID: {document_id}"
     except Exception as e:
         return f"Failed to delete document: {str(e)}"
\ No newline at end of file
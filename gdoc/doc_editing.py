@@ -0,0 +1,230 @@
+"""
+Edit plans for Google Docs.
+
+A list of operations, all written against the document as it is *now*,
+is compiled into a single documents.batchUpdate. Positional operations
+are applied back-to-front, so an edit never moves the indices of the edits
+still to be applied. Operations at the same index keep the order they were
+given in. replace_all runs last, after every positional edit.
+"""
+from googleapiclient.errors import HttpError
+
+from gdoc.auth import get_docs_service
+from gdoc.doc_reader import utf16_len
+
+PLAN_FIELDS = "revisionId,body/content/endIndex"
+
+TEXT_STYLE_KEYS = {
+    "bold": "bold",
+    "italic": "italic",
+    "underline": "underline",
+    "strikethrough": "strikethrough",
+}
+
+# Applied in this order when several operations share an index
+_RANK = {"delete": 0, "style": 1, "bullets": 1, "insert": 2, "table": 2}
+
+
+class EditPlanError(ValueError):
+    pass
+
+
+def _text_style(op):
+    style = {}
+    fields = []
+    for key, field in TEXT_STYLE_KEYS.items():
+        if key in op:
+            style[field] = bool(op[key])
+            fields.append(field)
+    if op.get("font_size"):
+        style["fontSize"] = {"magnitude": op["font_size"], "unit": "PT"}
+        fields.append("fontSize")
+    if op.get("link"):
+        style["link"] = {"url": op["link"]}
+        fields.append("link")
+    return style, ",".join(fields)
+
+
+def _style_requests(op, start, end):
+    """updateTextStyle / updateParagraphStyle / bullets for a range."""
+    requests = []
+    text_range = {"startIndex": start, "endIndex": end}
+    style, fields = _text_style(op)
+    if fields:
+        requests.append({"updateTextStyle": {"range": text_range, "textStyle": style, "fields": fields}})
+    if op.get("heading"):
+        requests.append({"updateParagraphStyle": {
+            "range": text_range,
+            "paragraphStyle": {"namedStyleType": op["heading"].upper()},
+            "fields": "namedStyleType",
+        }})
+    if op.get("bullets") is True or op.get("type") == "bullets":
+        if op.get("remove"):
+            requests.append({"deleteParagraphBullets": {"range": text_range}})
+        else:
+            requests.append({"createParagraphBullets": {
+                "range": text_range,
+                "bulletPreset": op.get("preset", "BULLET_DISC_CIRCLE_SQUARE"),
+            }})
+    return requests
+
+
+def _table_requests(index, rows, columns, cells):
+    """insertTable plus cell text, filled from the last cell backwards."""
+    requests = [{"insertTable": {"rows": rows, "columns": columns, "location": {"index": index}}}]
+    for row in reversed(range(rows)):
+        for column in reversed(range(columns)):
+            text = cells[row][column] if row < len(cells) and column < len(cells[row]) else ""
+            if text:
+                # The table starts after the newline inserted before it; each row
+                # and cell adds one index and every empty cell holds one newline.
+                cell_index = index + 4 + row * (2 * columns + 1) + 2 * column
+                requests.append({"insertText": {"location": {"index": cell_index}, "text": str(text)}})
+    return requests
+
+
+def _normalize(operations, end_index):
+    """Resolve default indices and validate each operation."""
+    plan = []
+    for position, op in enumerate(operations):
+        kind = op.get("type", "")
+        if kind == "replace_all":
+            if not op.get("find"):
+                raise EditPlanError(f"Operation {position + 1}: replace_all needs 'find'.")
+            plan.append((kind, None, None, position, op))
+            continue
+        if kind not in _RANK:
+            raise EditPlanError(f"Operation {position + 1}: unknown type '{kind}'.")
+        if kind in ("insert", "table"):
+            index = op.get("index")
+            start = end_index - 1 if index is None else int(index)
+            if not 1 <= start < end_index:
+                raise EditPlanError(f"Operation {position + 1}: index {start} is outside the document.")
+            if kind == "insert" and not op.get("text"):
+                raise EditPlanError(f"Operation {position + 1}: insert needs 'text'.")
+            if kind == "table" and (int(op.get("rows", 0)) < 1 or int(op.get("columns", 0)) < 1):
+                raise EditPlanError(f"Operation {position + 1}: table needs rows and columns.")
+            plan.append((kind, start, start, position, op))
+        else:
+            start, end = op.get("start_index"), op.get("end_index")
+            if start is None or end is None or not 1 <= int(start) < int(end) <= end_index:
+                raise EditPlanError(
+                    f"Operation {position + 1}: {kind} needs start_index < end_index inside the document."
+                )
+            plan.append((kind, int(start), int(end), position, op))
+    return plan
+
+
+def compile_edit_plan(operations, end_index):
+    """
+    Compile operations into batchUpdate requests.
+
+    Args:
+        operations (list[dict]): The edit plan (see docs_batch_edit).
+        end_index (int): endIndex of the document body's last element.
+
+    Returns:
+        list: Requests for documents.batchUpdate.
+    """
+    plan = _normalize(operations, end_index)
+    positional = [item for item in plan if item[0] != "replace_all"]
+    # Back-to-front; at one index deletes, then styles, then inserts in
+    # reverse so the inserted pieces read in the order they were given.
+    positional.sort(key=lambda item: (-item[1], _RANK[item[0]], -item[3] if _RANK[item[0]] == 2 else item[3]))
+
+    requests = []
+    applied = []  # (start, end, delta) of edits already emitted, in original indices
+    for kind, start, end, position, op in positional:
+        if kind in ("insert", "table"):
+            if kind == "insert":
+                text = op["text"]
+                requests.append({"insertText": {"location": {"index": start}, "text": text}})
+                length = utf16_len(text)
+                requests.extend(_style_requests(op, start, start + length))
+                applied.append((start, start, length))
+            else:
+                cells = op.get("cells") or []
+                requests.extend(_table_requests(start, int(op["rows"]), int(op["columns"]), cells))
+                applied.append((start, start, None))
+            continue
+
+        # Range operations: grow/shrink the end by edits already made inside the range.
+        shift = 0
+        for s, e, delta in applied:
+            if delta is None:
+                if start < s < end:
+                    raise EditPlanError(f"Operation {position + 1}: range contains an inserted table.")
+            elif delta >= 0:
+                if start < s < end:
+                    if kind == "delete":
+                        raise EditPlanError(f"Operation {position + 1}: delete range contains an insert.")
+                    shift += delta
+            elif s < end and e > start:
+                if s < start or e > end or kind == "delete":
+                    raise EditPlanError(f"Operation {position + 1}: range overlaps a deleted range.")
+                shift += delta
+        new_end = end + shift
+        if kind == "delete":
+            requests.append({"deleteContentRange": {"range": {"startIndex": start, "endIndex": new_end}}})
+            applied.append((start, end, start - end))
+        else:
+            requests.extend(_style_requests(op, start, new_end))
+
+    for kind, _, _, _, op in plan:
+        if kind == "replace_all":
+            requests.append({"replaceAllText": {
+                "containsText": {"text": op["find"], "matchCase": bool(op.get("match_case", True))},
+                "replaceText": op.get("replace", ""),
+            }})
+    return requests
+
+
+def docs_batch_edit(document_id: str, operations: list[dict], revision_id: str = "", tool_context=None) -> str:
+    """
+    Apply many edits to a Google Doc in one request.
+
+    All indices refer to the document as it is before any of the edits
+    (as returned by docs_operation 'read'), so operations never need to
+    account for each other.
+
+    Args:
+        document_id: The doc ID.
+        operations: The edits, each a dict with a "type":
+            - insert: text, index (omit for end of doc), optional bold/italic/underline/
+              strikethrough/font_size/link, heading (e.g. "HEADING_1") and bullets (true).
+            - delete: start_index, end_index.
+            - style: start_index, end_index plus any insert styling keys.
+            - bullets: start_index, end_index, optional preset or remove (true).
+            - table: rows, columns, index (omit for end of doc), optional cells (list of rows of text).
+            - replace_all: find, replace, optional match_case (applied after the other edits).
+        revision_id: Revision the indices were read from; the edit is rejected if the
+            doc changed since. Empty means the current revision.
+        tool_context: ADK-injected context.
+
+    Returns:
+        Result message.
+    """
+    if not operations:
+        return "No operations given."
+    service = get_docs_service()
+    try:
+        doc = service.documents().get(documentId=document_id, fields=PLAN_FIELDS).execute()
+        content = doc.get("body", {}).get("content", [])
+        end_index = content[-1].get("endIndex", 1) if content else 1
+        requests = compile_edit_plan(operations, end_index)
+        response = service.documents().batchUpdate(documentId=document_id, body={
+            "requests": requests,
+            "writeControl": {"requiredRevisionId": revision_id or doc["revisionId"]},
+        }).execute()
+    except EditPlanError as e:
+        return f"Edit plan rejected: {e}"
+    except HttpError as e:
+        if e.resp.status == 400 and "revision" in str(e).lower():
+            return "The document changed since it was read. Read it again and rebuild the edits."
+        return f"Error editing document {document_id}: {e}"
+
+    new_revision = response.get("writeControl", {}).get("requiredRevisionId", "")
+    return (
+        f"Applied {len(operations)} operation(s) ({len(requests)} requests) to document {document_id}. "
+        f"New revision: {new_revision}"
+    )
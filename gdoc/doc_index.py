@@ -0,0 +1,113 @@
+import re
+import difflib
+import threading
+
+from gdoc.auth import DRIVE_STORE
+
+# -----------------------------------------
+# DOCUMENT TITLE INDEX
+# -----------------------------------------
+# Title lookups and the recent-docs list are answered from an in-memory
+# view of the Google Docs in the shared Drive metadata store (persisted
+# in SQLite and kept current by the Drive changes feed). The view is
+# rebuilt only when the store has changed. Callers fall back to
+# files.list whenever the store is not ready.
+
+DOC_MIME = "application/vnd.google-apps.document"
+MAX_DOCS = 100000
+
+_snapshot_lock = threading.Lock()
+_snapshot = None  # (store version, view)
+
+
+def normalize(title):
+    return " ".join(title.casefold().split())
+
+
+def tokenize(title):
+    return set(re.findall(r"\w+", title.casefold()))
+
+
+def _get_snapshot():
+    global _snapshot
+    version = DRIVE_STORE.version
+    with _snapshot_lock:
+        if _snapshot is not None and _snapshot[0] == version:
+            return _snapshot[1]
+    docs = DRIVE_STORE.query(mime_type=DOC_MIME, limit=MAX_DOCS)
+    postings = {}
+    by_name = {}
+    for position, doc in enumerate(docs):
+        doc["name_lc"] = normalize(doc["name"])
+        for token in tokenize(doc["name"]):
+            postings.setdefault(token, []).append(position)
+        by_name.setdefault(doc["name_lc"], []).append(position)
+    snapshot = {
+        "docs": docs,
+        "postings": postings,
+        "by_name": by_name,
+        "names": [doc["name_lc"] for doc in docs],
+    }
+    with _snapshot_lock:
+        _snapshot = (version, snapshot)
+    return snapshot
+
+
+def _public(doc):
+    return {"id": doc["id"], "name": doc["name"], "modifiedTime": doc["modifiedTime"]}
+
+
+def recent_docs(drive, limit=20):
+    """The most recently modified docs, or None when the caller should list live."""
+    if not DRIVE_STORE.ensure_fresh(drive):
+        return None
+    return [_public(doc) for doc in _get_snapshot()["docs"][:limit]]
+
+
+def match_title(drive, title, limit=20):
+    """
+    Resolve a title against the index.
+
+    Exact (case-insensitive) matches win. Otherwise titles containing the
+    query, sharing words with it, or close to it by difflib ratio are
+    ranked by similarity, then by modifiedTime.
+
+    Returns:
+        list | None: Matching docs, or None when the caller should query live.
+    """
+    if not DRIVE_STORE.ensure_fresh(drive):
+        return None
+    snapshot = _get_snapshot()
+    docs = snapshot["docs"]
+    query = normalize(title)
+    exact = snapshot["by_name"].get(query)
+    if exact:
+        return [_public(docs[position]) for position in exact[:limit]]
+
+    query_tokens = tokenize(title)
+    overlap = {}
+    for token in query_tokens:
+        for position in snapshot["postings"].get(token, ()):
+            overlap[position] = overlap.get(position, 0) + 1
+    for position, name in enumerate(snapshot["names"]):
+        if query in name:
+            overlap[position] = max(overlap.get(position, 0), len(query_tokens) or 1)
+    if not overlap:
+        close = difflib.get_close_matches(query, snapshot["names"], n=limit, cutoff=0.6)
+        overlap = {snapshot["names"].index(name): 0 for name in close}
+
+    def score(position):
+        ratio = difflib.SequenceMatcher(None, query, docs[position]["name_lc"]).ratio()
+        return overlap[position] / (len(query_tokens) or 1) + ratio
+
+    ranked = sorted(overlap, key=lambda position: (-score(position), position))
+    return [_public(docs[position]) for position in ranked[:limit]]
+
+
+def upsert_doc(file):
+    """Record a doc created or renamed through the API before the next sync sees it."""
+    DRIVE_STORE.upsert(dict(file, mimeType=DOC_MIME))
+
+
+def remove_doc(document_id):
+    DRIVE_STORE.remove(document_id)
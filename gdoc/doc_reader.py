@@ -0,0 +1,142 @@
+"""
+Streaming reader for Google Docs bodies.
+
+Walks the structural elements of a document (paragraphs, lists, headings,
+tables, tables of contents) in order and yields text runs with their
+document indices, so long documents can be read in bounded chunks.
+"""
+
+DEFAULT_READ_CHARS = 8000
+
+HEADING_LEVELS = {"TITLE": 1, "SUBTITLE": 2}
+HEADING_LEVELS.update({f"HEADING_{n}": n for n in range(1, 7)})
+
+
+def utf16_len(text):
+    """Docs indices count UTF-16 code units, not Python characters."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _skip_units(text, units):
+    """Drop the first `units` UTF-16 code units of text."""
+    skipped = 0
+    for position, char in enumerate(text):
+        if skipped >= units:
+            return text[position:]
+        skipped += 2 if ord(char) > 0xFFFF else 1
+    return ""
+
+
+def _paragraph_prefix(paragraph):
+    style = paragraph.get("paragraphStyle", {}).get("namedStyleType", "")
+    if style in HEADING_LEVELS:
+        return "#" * HEADING_LEVELS[style] + " "
+    if "bullet" in paragraph:
+        return "  " * paragraph["bullet"].get("nestingLevel", 0) + "• "
+    return ""
+
+
+def _iter_table(table):
+    for row in table.get("tableRows", []):
+        cells = row.get("tableCells", [])
+        for number, cell in enumerate(cells):
+            runs = list(iter_text_runs(cell.get("content", [])))
+            # Keep each cell on one line: drop the cell's closing newline.
+            if runs and runs[-1][2].endswith("\n"):
+                start, end, text = runs[-1]
+                runs[-1] = (start, end, text[:-1])
+            yield from runs
+            separator = " | " if number < len(cells) - 1 else "\n"
+            yield cell.get("endIndex", 0), cell.get("endIndex", 0), separator
+
+
+def iter_text_runs(content):
+    """
+    Yield (start_index, end_index, text) for every piece of text in a
+    list of structural elements, in document order.
+
+    Markdown-style markers for headings and bullets, and the separators
+    between table cells, are yielded as zero-length runs.
+    """
+    for element in content:
+        if "paragraph" in element:
+            paragraph = element["paragraph"]
+            prefix = _paragraph_prefix(paragraph)
+            if prefix:
+                yield element.get("startIndex", 0), element.get("startIndex", 0), prefix
+            for item in paragraph.get("elements", []):
+                text = item.get("textRun", {}).get("content")
+                if text:
+                    yield item.get("startIndex", 0), item.get("endIndex", 0), text
+        elif "table" in element:
+            yield from _iter_table(element["table"])
+        elif "tableOfContents" in element:
+            yield from iter_text_runs(element["tableOfContents"].get("content", []))
+
+
+def read_range(doc, start_index=None, end_index=None, max_chars=DEFAULT_READ_CHARS):
+    """
+    Read up to max_chars of a document's body, starting at start_index.
+
+    Args:
+        doc (dict): A documents.get response (needs body; revisionId optional).
+        start_index (int): First document index to read (default: start).
+        end_index (int): Stop before this index (default: end of body).
+        max_chars (int): Size of the chunk to return.
+
+    Returns:
+        dict: text, start_index, end_index, next_index (None when done),
+        document_end and revision_id.
+    """
+    content = doc.get("body", {}).get("content", [])
+    document_end = content[-1].get("endIndex", 1) if content else 1
+    start_index = start_index or 1
+    max_chars = max(max_chars or DEFAULT_READ_CHARS, 100)
+    end_index = end_index or document_end
+
+    parts = []
+    used = 0
+    first = last = None
+    next_index = None
+    for run_start, run_end, text in iter_text_runs(content):
+        if run_start < start_index:
+            if run_end <= start_index:
+                continue
+            # The previous chunk ended inside this run; resume mid-run.
+            text = _skip_units(text, start_index - run_start)
+            run_start = start_index
+        if run_start >= end_index:
+            break
+        if used + len(text) > max_chars:
+            room = max_chars - used
+            if parts or room <= 0 or run_start == run_end:
+                next_index = run_start
+                break
+            # A single run larger than the budget is split inside the run.
+            text = text[:room]
+            run_end = run_start + utf16_len(text)
+            next_index = run_end
+        parts.append(text)
+        used += len(text)
+        first = run_start if first is None else first
+        last = run_end
+        if next_index is not None:
+            break
+
+    return {
+        "text": "".join(parts),
+        "start_index": first if first is not None else start_index,
+        "end_index": last if last is not None else start_index,
+        "next_index": next_index,
+        "document_end": document_end,
+        "revision_id": doc.get("revisionId", ""),
+    }
+
+
+def section_text(doc, section):
+    """Plain text of a document's "headers" or "footers" (keyed by id)."""
+    return "".join(
+        text
+        for item in doc.get(section, {}).values()
+        for _, _, text in iter_text_runs(item.get("content", []))
+    ).strip()
@@ -1,18 +1,21 @@
 from gdoc.auth import get_drive_service
+from gdoc import doc_index
 
 def list_my_google_docs(tool_context=None, limit: int = 20) -> str:
     """
     List the user's most recent Google Docs (this version is ADK-proof).
     """
     drive = get_drive_service()
-    results = drive.files().list(
-        q="mimeType='application/vnd.google-apps.document' and trashed=false",
-        orderBy="modifiedTime desc",
-        fields="files(id, name, modifiedTime)",
-        pageSize=limit
-    ).execute()
-
-    files = results.get('files', [])
+    # Served from the local index; list live until it is ready.
+    files = doc_index.recent_docs(drive, limit)
+    if files is None:
+        results = drive.files().list(
+            q="mimeType='application/vnd.google-apps.document' and trashed=false",
+            orderBy="modifiedTime desc",
+            fields="files(id, name, modifiedTime)",
+            pageSize=limit
+        ).execute()
+        files = results.get('files', [])
     if not files:
         return "You have no Google Docs right now."
 
@@ -43,21 +46,24 @@ def find_document_by_title(title: str, tool_context=None) -> str:
         return f"Using cached document '{title}' → ID: {doc_id}"
 
     drive = get_drive_service()
-    # Exact match
-    query = f"name = '{title}' and mimeType='application/vnd.google-apps.document' and trashed=false"
-    results = drive.files().list(q=query, fields="files(id,name,modifiedTime)", pageSize=10).execute()
-    files = results.get('files', [])
+    # Persistent index first (ranked by similarity, then recency)
+    files = doc_index.match_title(drive, title)
+    if files is None:
+        # Exact match
+        query = f"name = '{title}' and mimeType='application/vnd.google-apps.document' and trashed=false"
+        results = drive.files().list(q=query, fields="files(id,name,modifiedTime)", pageSize=10).execute()
+        files = results.get('files', [])
 
-    # Fuzzy fallback
-    if not files:
-        fuzzy = f"name contains '{title}' and mimeType='application/vnd.google-apps.document' and trashed=false"
-        files = drive.files().list(q=fuzzy, fields="files(id,name,modifiedTime)", pageSize=20).execute().get('files', [])
+        # Fuzzy fallback
+        if not files:
+            fuzzy = f"name contains '{title}' and mimeType='application/vnd.google-apps.document' and trashed=false"
+            files = drive.files().list(q=fuzzy, fields="files(id,name,modifiedTime)", pageSize=20).execute().get('files', [])
+
+        files.sort(key=lambda x: x['modifiedTime'], reverse=True)
 
     if not files:
         return f"Error: No Google Doc found matching title '{title}'"
 
-    files.sort(key=lambda x: x['modifiedTime'], reverse=True)
-
     if len(files) == 1:
         chosen = files[0]
         session_state["title_to_id"][clean_title] = chosen['id']
@@ -1,4 +1,4 @@
-from gdoc.auth import get_drive_service
+from gdoc.auth import DRIVE_STORE, get_drive_service
 
 def share_google_doc(document_id: str, email: str, role: str = "writer", tool_context=None) -> str:
     """
@@ -20,6 +20,7 @@ def share_google_doc(document_id: str, email: str, role: str = "writer", tool_co
             'emailAddress': email
         }
         drive.permissions().create(fileId=document_id, body=permission, sendNotificationEmail=True).execute()
+        DRIVE_STORE.refresh_file(drive, document_id)
         return f"Shared '{document_id}' with {email} as {role} ✅"
     except Exception as e:
         return f"Failed to share: {str(e)}"
@@ -31,8 +32,14 @@ def get_doc_permissions(document_id: str, tool_context=None) -> str:
     """
     drive = get_drive_service()
     try:
-        permissions = drive.permissions().list(fileId=document_id).execute()
-        perms = permissions.get('permissions', [])
+        stored = DRIVE_STORE.get(document_id) if DRIVE_STORE.ensure_fresh(drive) else None
+        if stored and stored["permissions"] is not None:
+            perms = stored["permissions"]
+        else:
+            permissions = drive.permissions().list(
+                fileId=document_id, fields="permissions(id,type,role,emailAddress)"
+            ).execute()
+            perms = permissions.get('permissions', [])
         if not perms:
             return "No sharing permissions set."
         
@@ -53,6 +60,7 @@ def update_doc_permission(document_id: str, permission_id: str, role: str, tool_
     drive = get_drive_service()
     try:
         drive.permissions().update(fileId=document_id, permissionId=permission_id, body={'role': role}).execute()
+        DRIVE_STORE.refresh_file(drive, document_id)
         return f"Updated permission {permission_id} to {role}"
     except Exception as e:
         return f"Failed to update permission: {str(e)}"
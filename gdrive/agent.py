@@ -5,13 +5,15 @@ from dotenv import load_dotenv
 import os
 load_dotenv()
 import pathlib
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.adk.sessions import InMemorySessionService
-import base64
+import shutil
+import tempfile
 from google.auth.transport.requests import Request
 
+from gclient import DriveStore, get_service
+from gdrive import content_cache, file_reader, folder_tree, query_builder, uploader
+
 session_service = InMemorySessionService()
 
 
@@ -63,9 +65,17 @@ def authenticate_and_save(app: str = "drive"):
 
 # -- Google Drive Client --
 def get_drive_client():
-    authenticate_and_save("drive")
-    creds = Credentials.from_authorized_user_file(GDRIVE_CREDENTIALS_PATH, DRIVE_SCOPES)
-    return build("drive", "v3", credentials=creds)
+    return get_service("drive", "v3", DRIVE_SCOPES, GDRIVE_CREDENTIALS_PATH, authenticate_and_save)
+
+# Local file metadata, kept current by the Drive changes feed
+DRIVE_STORE = DriveStore(
+    os.getcwd() + "/gdrive/credentials/.drive-store.sqlite3",
+    GDRIVE_CREDENTIALS_PATH,
+    DRIVE_SCOPES,
+    authenticate_and_save,
+    get_drive_client,
+)
+STORE_CURSOR_PREFIX = "store:"
 
 def list_drive_files(page_size: int = 10, cursor: str = "", query: str = "") -> dict:
     """List files in Google Drive.
@@ -78,10 +88,22 @@ def list_drive_files(page_size: int = 10, cursor: str = "", query: str = "") ->
     """
 
     drive = get_drive_client()
-    if not query:
-        query = "trashed = false"
-    else:
-        query = f"name contains '{query}' and trashed = false"
+    # Answer from the local store unless continuing a live listing.
+    if (not cursor or cursor.startswith(STORE_CURSOR_PREFIX)) and DRIVE_STORE.ensure_fresh(drive):
+        offset = int(cursor[len(STORE_CURSOR_PREFIX):]) if cursor else 0
+        files = DRIVE_STORE.query(name_contains=query or None, limit=page_size + 1, offset=offset)
+        next_cursor = f"{STORE_CURSOR_PREFIX}{offset + page_size}" if len(files) > page_size else None
+        return {"resources": [{"uri": f"gdrive:///{f['id']}", "mimeType": f["mimeType"], "name": f["name"]} for f in files[:page_size]], "nextCursor": next_cursor}
+    if cursor and cursor.startswith(STORE_CURSOR_PREFIX):
+        # A store offset means nothing to files.list; never forward it as a pageToken.
+        return {
+            "status": "error",
+            "message": "The local file index is being refreshed, so this cursor expired. List again without a cursor.",
+            "resources": [],
+            "nextCursor": None,
+        }
+
+    query = query_builder.build_query(name_contains=query or None)
     params = {"pageSize": page_size, "fields": "nextPageToken, files(id, name, mimeType)", "q": query}
     if cursor:
         params["pageToken"] = cursor
@@ -89,26 +111,233 @@ def list_drive_files(page_size: int = 10, cursor: str = "", query: str = "") ->
     files = resp.get("files", [])
     return {"resources": [{"uri": f"gdrive:///{f['id']}", "mimeType": f["mimeType"], "name": f["name"]} for f in files], "nextCursor": resp.get("nextPageToken")}
 
-def read_drive_file(file_id: str):
+def read_drive_file(file_id: str, mode: str = "head", offset: int = 0, max_bytes: int = 0,
+                    save_to_file: bool = False) -> dict:
+    """Read part of a Google Drive file without loading all of it.
+    Args:
+        file_id (str): The file ID.
+        mode (str): "head" (start of file), "tail" (end of file) or "offset" (from offset).
+        offset (int): First byte to read in "offset" mode.
+        max_bytes (int): Byte budget for the returned content (0 = default; capped).
+        save_to_file (bool): Download the whole file to a local temp file instead and return its path.
+    Returns:
+        dict: The content window (text, or base64 for binary) with its byte range and the file size,
+        or the local path when save_to_file is set.
+    """
     drive = get_drive_client()
-    meta = drive.files().get(fileId=file_id, fields="mimeType").execute()
+    meta = drive.files().get(fileId=file_id, fields=file_reader.METADATA_FIELDS).execute()
     mime = meta.get("mimeType", "")
-    if mime.startswith("application/vnd.google-apps"):
-        exports = {
-            "application/vnd.google-apps.document": "text/markdown",
-            "application/vnd.google-apps.spreadsheet": "text/csv",
-            "application/vnd.google-apps.presentation": "text/plain",
-            "application/vnd.google-apps.drawing": "image/png",
+    google_type = file_reader.is_google_type(mime)
+    content_type = file_reader.export_type(mime) if google_type else mime
+
+    version = meta.get("md5Checksum") or meta.get("modifiedTime", "")
+    key = content_cache.cache_key(file_id, version, content_type if google_type else "")
+    cached = content_cache.open_cached(key)
+
+    def media_request():
+        if google_type:
+            return drive.files().export_media(fileId=file_id, mimeType=content_type)
+        return drive.files().get_media(fileId=file_id)
+
+    if save_to_file:
+        suffix = os.path.splitext(meta.get("name", ""))[1]
+        with tempfile.NamedTemporaryFile(delete=False, prefix="gdrive-", suffix=suffix) as out:
+            if cached:
+                with cached:
+                    shutil.copyfileobj(cached, out)
+                size = out.tell()
+            else:
+                size = file_reader.download_to(media_request(), out)
+        return {"name": meta.get("name"), "mimeType": content_type, "size": size, "path": out.name}
+
+    budget = file_reader.clamp_budget(max_bytes)
+    if cached is None and (google_type or int(meta.get("size", 0)) <= content_cache.FULL_DOWNLOAD_LIMIT):
+        cached = content_cache.store(key, media_request())
+    if cached is None and google_type:
+        # Cache disabled: exports cannot be ranged, so stream into a spool instead.
+        cached = file_reader.spool_export(drive, file_id, content_type)
+
+    if cached is not None:
+        with cached:
+            cached.seek(0, os.SEEK_END)
+            size = cached.tell()
+            start, end = file_reader.window(mode, offset, budget, size)
+            cached.seek(start)
+            data = cached.read(end - start)
+    else:
+        size = int(meta.get("size", 0))
+        start, end = file_reader.window(mode, offset, budget, size)
+        data = file_reader.read_range(drive, file_id, start, end)
+
+    content, encoding = file_reader.encode(data, content_type)
+    return {
+        "name": meta.get("name"),
+        "mimeType": content_type,
+        "size": size,
+        "start": start,
+        "end": end,
+        "truncated": start > 0 or end < size,
+        "encoding": encoding,
+        "content": content,
+    }
+
+
+def search_drive_files(
+    name_contains: str = "",
+    mime_type: str = "",
+    full_text: str = "",
+    modified_after: str = "",
+    modified_before: str = "",
+    folder_path: str = "",
+    folder_id: str = "",
+    owner: str = "",
+    starred_only: bool = False,
+    order_by: str = "modifiedTime desc",
+    fields: list[str] = None,
+    page_size: int = 20,
+    cursor: str = "",
+) -> dict:
+    """Search Google Drive with server-side filters.
+    Args:
+        name_contains (str): Text the file name must contain.
+        mime_type (str): Type alias (doc, sheet, slides, folder, pdf, image, video, audio, text, form, drawing)
+            or a full MIME type.
+        full_text (str): Text to search for in file contents and names.
+        modified_after (str): Only files modified after this date (YYYY-MM-DD or ISO datetime).
+        modified_before (str): Only files modified before this date.
+        folder_path (str): Only direct children of this folder path (e.g. "Projects/2024").
+        folder_id (str): Only direct children of this folder ID.
+        owner (str): Only files owned by this email address ("me" for the user).
+        starred_only (bool): Only starred files.
+        order_by (str): Sort order, e.g. "modifiedTime desc", "name", "quotaBytesUsed desc".
+        fields (list[str]): File fields to return (default: id, name, mimeType, modifiedTime, size).
+        page_size (int): Number of files per page.
+        cursor (str): nextCursor from a previous search with the same filters.
+    Returns:
+        dict: Matching files, the next page cursor and the query that was sent.
+    """
+    drive = get_drive_client()
+    try:
+        if folder_path and not folder_id:
+            store = DRIVE_STORE if DRIVE_STORE.ensure_fresh(drive) else None
+            folder = folder_tree.resolve_path(drive, folder_path, store)
+            if folder is None:
+                return {"status": "error", "message": f"Folder not found: {folder_path}"}
+            folder_id = folder["id"]
+        q = query_builder.build_query(
+            name_contains=name_contains or None,
+            mime_type=mime_type or None,
+            full_text=full_text or None,
+            modified_after=modified_after or None,
+            modified_before=modified_before or None,
+            parent_id=folder_id or None,
+            owner=owner or None,
+            starred=True if starred_only else None,
+        )
+        params = {
+            "q": q,
+            "fields": query_builder.build_fields(fields),
+            "pageSize": max(1, min(page_size, 1000)),
         }
-        out_type = exports.get(mime, "text/plain")
-        data = drive.files().export(fileId=file_id, mimeType=out_type).execute()
-        return {"mimeType": out_type, "content": data}
-    resp = drive.files().get_media(fileId=file_id).execute()
-    if mime.startswith("text/") or mime == "application/json":
-        text = resp.decode("utf-8")
+        # Drive rejects orderBy together with fullText search.
+        if order_by and not full_text:
+            params["orderBy"] = query_builder.build_order_by(order_by)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    if cursor:
+        params["pageToken"] = cursor
+    resp = drive.files().list(**params).execute()
+    return {
+        "status": "success",
+        "query": q,
+        "files": resp.get("files", []),
+        "nextCursor": resp.get("nextPageToken"),
+    }
+
+
+def get_folder_tree(path: str = "", folder_id: str = "", depth: int = 2, include_files: bool = False) -> dict:
+    """Walk a Drive folder recursively and summarize it as a tree with sizes.
+    Args:
+        path (str): Folder path from My Drive, e.g. "Projects/2024". Empty means My Drive.
+        folder_id (str): Folder ID to walk instead of a path.
+        depth (int): Levels of subfolders to show (sizes always cover the whole subtree).
+        include_files (bool): List individual files in the shown levels, not only folders.
+    Returns:
+        dict: Total size and counts plus the folder tree (largest first).
+    """
+    drive = get_drive_client()
+    store = DRIVE_STORE if DRIVE_STORE.ensure_fresh(drive) else None
+    if folder_id:
+        stored = store.get(folder_id) if store is not None else None
+        folder = {"id": folder_id, "name": stored["name"] if stored else folder_id}
     else:
-        text = base64.b64encode(resp).decode("utf-8")    
-        return {"mimeType": mime, "content": text}
+        folder = folder_tree.resolve_path(drive, path, store)
+        if folder is None:
+            return {"status": "error", "message": f"Folder not found: {path}"}
+
+    root, truncated = folder_tree.walk(drive, folder, store)
+    tree = folder_tree.summarize(root, max(0, depth), include_files)
+    return {
+        "status": "success",
+        "path": path or "My Drive",
+        "id": folder["id"],
+        "total_size": tree["size"],
+        "total_size_human": folder_tree.human_size(tree["size"]),
+        "file_count": tree["files"],
+        "folder_count": tree["folders"],
+        "truncated": truncated,
+        "tree": tree,
+    }
+
+
+def upload_drive_file(local_path: str, name: str = "", parent_id: str = "", folder_path: str = "",
+                      mime_type: str = "", chunk_size_mb: int = uploader.DEFAULT_CHUNK_MB) -> dict:
+    """Upload a local file to Google Drive (chunked and resumable).
+    Args:
+        local_path (str): Path of the file on this machine.
+        name (str): Name in Drive (default: the local file name).
+        parent_id (str): Folder ID to upload into.
+        folder_path (str): Folder path to upload into (e.g. "Projects/2024"), if no parent_id.
+        mime_type (str): Content type (default: guessed from the name).
+        chunk_size_mb (int): Size of each upload chunk in MB.
+    Returns:
+        dict: The new file's ID, name, size and progress, or error details.
+    """
+    if not os.path.isfile(local_path):
+        return {"status": "error", "message": f"File not found: {local_path}"}
+    drive = get_drive_client()
+    name = name or os.path.basename(local_path)
+    if folder_path and not parent_id:
+        store = DRIVE_STORE if DRIVE_STORE.ensure_fresh(drive) else None
+        folder = folder_tree.resolve_path(drive, folder_path, store)
+        if folder is None:
+            return {"status": "error", "message": f"Folder not found: {folder_path}"}
+        parent_id = folder["id"]
+
+    progress = []
+
+    def report(fraction):
+        percent = int(fraction * 100)
+        if not progress or percent > progress[-1]:
+            progress.append(percent)
+            print(f"Uploading {name}: {percent}%")
+
+    try:
+        file, resumed = uploader.upload_file(drive, local_path, name, parent_id, mime_type, chunk_size_mb, report)
+    except Exception as e:
+        return {"status": "error", "message": f"Upload failed (run again to resume): {str(e)}", "progress": progress}
+
+    DRIVE_STORE.upsert(file)
+    return {
+        "status": "success",
+        "id": file["id"],
+        "name": file.get("name"),
+        "mimeType": file.get("mimeType"),
+        "size": int(file.get("size") or 0),
+        "resumed": resumed,
+        "progress": progress,
+        "uri": f"gdrive:///{file['id']}",
+    }
 
 
 # ============================================================
@@ -123,10 +352,16 @@ def gdrive():
         "and read their Google Drive files using the available tools. "
         "Capabilities: "
         "1. You can list files in Google Drive. "
-        "2. You can search files by name. "
+        "2. You can search files by name, and with search_drive_files filter by type, contents, "
+        "modified date, folder, owner or starred, sorted server-side. "
         "3. You can paginate results using the cursor returned by list_drive_files. "
         "4. You can read the contents of Google Drive files via read_drive_file. "
+        "Large files are read in windows: use mode 'head', 'tail' or 'offset' (with the returned end as the next offset), "
+        "or save_to_file to download the whole file locally. "
         "5. When reading Google Docs, Sheets, Slides, or Drawings, export them to readable formats. "
+        "6. You can summarize a folder (by path like 'Projects/2024' or ID) recursively with get_folder_tree, "
+        "including total size and file counts, in one call. "
+        "7. You can upload local files with upload_drive_file; if an upload fails, calling it again resumes it. "
         "Rules: "
         'Always use the provided tools for Google Drive operations. '
         'Never make up file names or file contents. '
@@ -136,7 +371,7 @@ def gdrive():
     ),
 
     tools=[
-        list_drive_files, read_drive_file, 
+        list_drive_files, search_drive_files, read_drive_file, get_folder_tree, upload_drive_file,
     ],
 )
 
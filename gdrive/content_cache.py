@@ -0,0 +1,113 @@
+import io
+import os
+import hashlib
+import pathlib
+import tempfile
+import threading
+
+from gdrive.file_reader import download_to
+
+# -----------------------------------------
+# CONTENT-ADDRESSED DOWNLOAD CACHE
+# -----------------------------------------
+# Exports and downloads are kept on disk under a key derived from
+# (fileId, md5Checksum or modifiedTime, export mimeType), so a changed
+# file gets a new key and stale copies are never served; they simply age
+# out. Reads touch the file's mtime and eviction removes the least
+# recently used entries once the cache grows past CACHE_MAX_BYTES.
+# Set GDRIVE_CACHE_MAX_BYTES=0 to disable the cache.
+
+CACHE_DIR = os.getcwd() + "/gdrive/credentials/.content-cache"
+CACHE_MAX_BYTES = int(os.getenv("GDRIVE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+# Binary files up to this size are downloaded whole (and cached) even for a window read
+FULL_DOWNLOAD_LIMIT = int(os.getenv("GDRIVE_CACHE_FULL_DOWNLOAD_LIMIT", str(16 * 1024 * 1024)))
+
+_evict_lock = threading.Lock()
+
+
+class _RemovedOnClose(io.FileIO):
+    """A spilled download that is not kept: the file goes away once the reader closes it."""
+
+    def close(self):
+        super().close()
+        try:
+            os.unlink(self.name)
+        except OSError:
+            pass
+
+
+def cache_key(file_id, version, export_mime=""):
+    return hashlib.sha256(f"{file_id}:{version}:{export_mime}".encode()).hexdigest()
+
+
+def _path(key):
+    return os.path.join(CACHE_DIR, key)
+
+
+def open_cached(key):
+    """Open a cached copy for reading (marking it recently used), or None."""
+    if CACHE_MAX_BYTES <= 0:
+        return None
+    try:
+        f = open(_path(key), "rb")
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(f.name)
+    except OSError:
+        pass
+    return f
+
+
+def store(key, request):
+    """
+    Download a media/export request into the cache.
+
+    Returns:
+        file | None: The new entry opened for reading, or None when the cache is disabled.
+    """
+    if CACHE_MAX_BYTES <= 0:
+        return None
+    pathlib.Path(CACHE_DIR).mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=CACHE_DIR, prefix=".partial-", delete=False) as tmp:
+        try:
+            download_to(request, tmp)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    # Files are only renamed or removed while closed so this also works on Windows.
+    if os.path.getsize(tmp.name) > CACHE_MAX_BYTES:
+        # Too large to keep: serve this read from the temp file and drop it afterwards.
+        return io.BufferedReader(_RemovedOnClose(tmp.name, "rb"))
+    os.replace(tmp.name, _path(key))
+    f = open(_path(key), "rb")
+    evict(keep=key)
+    return f
+
+
+def evict(keep=None):
+    """Remove least recently used entries until the cache fits CACHE_MAX_BYTES."""
+    with _evict_lock:
+        entries = []
+        total = 0
+        for entry in os.scandir(CACHE_DIR):
+            if not entry.is_file() or entry.name.startswith(".partial-"):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path, entry.name))
+            total += stat.st_size
+        entries.sort()
+        for _, size, path, name in entries:
+            if total <= CACHE_MAX_BYTES:
+                break
+            if name == keep:
+                continue
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except PermissionError:
+                # Still open by a reader (Windows): leave it for a later eviction.
+                continue
+            total -= size
@@ -0,0 +1,89 @@
+import os
+import base64
+import tempfile
+
+from googleapiclient.http import MediaIoBaseDownload
+
+# -----------------------------------------
+# BOUNDED DRIVE READS
+# -----------------------------------------
+# Files are never loaded whole into memory. Binary media is read with an
+# HTTP Range request covering only the requested window; Google exports
+# (which do not support ranges) are streamed chunk by chunk with
+# MediaIoBaseDownload into a spooled temp file that moves to disk past
+# SPOOL_MEMORY bytes. Whole files can be downloaded to a temp file.
+
+DEFAULT_MAX_BYTES = int(os.getenv("GDRIVE_READ_MAX_BYTES", "65536"))
+HARD_MAX_BYTES = int(os.getenv("GDRIVE_READ_HARD_MAX_BYTES", str(1024 * 1024)))
+DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+SPOOL_MEMORY = 4 * 1024 * 1024
+
+METADATA_FIELDS = "id,name,mimeType,size,modifiedTime,md5Checksum"
+
+EXPORT_TYPES = {
+    "application/vnd.google-apps.document": "text/markdown",
+    "application/vnd.google-apps.spreadsheet": "text/csv",
+    "application/vnd.google-apps.presentation": "text/plain",
+    "application/vnd.google-apps.drawing": "image/png",
+}
+
+TEXT_TYPES = ("application/json", "application/xml", "application/javascript", "application/x-yaml")
+
+
+def is_google_type(mime):
+    return mime.startswith("application/vnd.google-apps")
+
+
+def is_text(mime):
+    return mime.startswith("text/") or mime in TEXT_TYPES
+
+
+def export_type(mime):
+    return EXPORT_TYPES.get(mime, "text/plain")
+
+
+def clamp_budget(max_bytes):
+    return max(1, min(max_bytes or DEFAULT_MAX_BYTES, HARD_MAX_BYTES))
+
+
+def window(mode, offset, max_bytes, size):
+    """The [start, end) byte window for a head/tail/offset read of a size-byte file."""
+    if mode == "tail":
+        start = max(0, size - max_bytes)
+    elif mode == "offset":
+        start = min(max(0, offset), size)
+    else:
+        start = 0
+    return start, min(size, start + max_bytes)
+
+
+def download_to(request, fileobj, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """Stream a media request into fileobj chunk by chunk; return the byte count."""
+    downloader = MediaIoBaseDownload(fileobj, request, chunksize=chunk_size)
+    done = False
+    while not done:
+        _, done = downloader.next_chunk(num_retries=3)
+    return fileobj.tell()
+
+
+def read_range(drive, file_id, start, end):
+    """Fetch bytes [start, end) of a binary file with one Range request."""
+    if end <= start:
+        return b""
+    request = drive.files().get_media(fileId=file_id)
+    request.headers["range"] = f"bytes={start}-{end - 1}"
+    return request.execute()
+
+
+def spool_export(drive, file_id, mime):
+    """Stream an export into a SpooledTemporaryFile (caller closes it)."""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY)
+    download_to(drive.files().export_media(fileId=file_id, mimeType=mime), spool)
+    return spool
+
+
+def encode(data, mime):
+    """Text for text types (a window may split a character), base64 otherwise."""
+    if is_text(mime):
+        return data.decode("utf-8", errors="replace"), "text"
+    return base64.b64encode(data).decode("ascii"), "base64"
@@ -0,0 +1,144 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from gclient.drive_store import FOLDER_MIME
+from gdrive.query_builder import escape
+
+# -----------------------------------------
+# FOLDER TREE ENGINE
+# -----------------------------------------
+# Paths are resolved and folders walked level by level: every folder of a
+# level is listed at once on a small thread pool (one paginated files.list
+# per folder with a fields projection), or read from the local Drive store
+# when it is fresh, in which case no API call is made at all. Sizes are
+# aggregated bottom-up so a whole subtree is summarized in one tool call.
+
+TREE_WORKERS = int(os.getenv("GDRIVE_TREE_WORKERS", "8"))
+MAX_FOLDERS = int(os.getenv("GDRIVE_TREE_MAX_FOLDERS", "2000"))
+CHILD_FIELDS = "nextPageToken,files(id,name,mimeType,size,modifiedTime)"
+STORE_LIMIT = 1000000
+
+_executor = ThreadPoolExecutor(max_workers=TREE_WORKERS, thread_name_prefix="drive-tree")
+
+
+def list_children(drive, folder_id, store=None):
+    """Every non-trashed item directly inside a folder."""
+    if store is not None:
+        return store.query(parent_id=folder_id, limit=STORE_LIMIT)
+    children = []
+    page_token = None
+    while True:
+        response = drive.files().list(
+            q=f"'{escape(folder_id)}' in parents and trashed = false",
+            fields=CHILD_FIELDS,
+            pageSize=1000,
+            pageToken=page_token,
+        ).execute()
+        children.extend(response.get("files", []))
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return children
+
+
+def resolve_path(drive, path, store=None):
+    """
+    Resolve "Projects/2024/Reports" (relative to My Drive) to a folder.
+
+    Returns:
+        dict | None: {"id", "name"} of the folder, or None when a segment is missing.
+    """
+    folder = {"id": store.root_id(drive) if store is not None else "root", "name": "My Drive"}
+    for segment in [part for part in path.strip().strip("/").split("/") if part]:
+        wanted = segment.casefold()
+        if store is not None:
+            candidates = store.query(parent_id=folder["id"], mime_type=FOLDER_MIME, limit=STORE_LIMIT)
+        else:
+            candidates = drive.files().list(
+                q=(
+                    f"'{escape(folder['id'])}' in parents and name = '{escape(segment)}' "
+                    f"and mimeType = '{FOLDER_MIME}' and trashed = false"
+                ),
+                fields="files(id,name)",
+                pageSize=10,
+            ).execute().get("files", [])
+        match = next((c for c in candidates if c["name"].casefold() == wanted), None)
+        if match is None:
+            return None
+        folder = {"id": match["id"], "name": match["name"]}
+    return folder
+
+
+def walk(drive, folder, store=None, max_folders=MAX_FOLDERS):
+    """
+    Breadth-first walk of a folder, listing each level in parallel.
+
+    Returns:
+        tuple: (root node, truncated). Nodes are dicts with id, name and,
+        for folders, "children"; sizes are not aggregated yet.
+    """
+    root = {"id": folder["id"], "name": folder["name"], "mimeType": FOLDER_MIME, "children": []}
+    frontier = [root]
+    seen = {root["id"]}
+    listed = 0
+    truncated = False
+    while frontier:
+        if listed + len(frontier) > max_folders:
+            frontier = frontier[:max_folders - listed]
+            truncated = True
+        listed += len(frontier)
+        results = _executor.map(lambda node: list_children(drive, node["id"], store), frontier)
+        next_frontier = []
+        for node, children in zip(frontier, results):
+            for child in children:
+                item = {
+                    "id": child["id"],
+                    "name": child["name"],
+                    "mimeType": child["mimeType"],
+                    "size": int(child.get("size") or 0),
+                }
+                if child["mimeType"] == FOLDER_MIME:
+                    # A folder can have several parents; walk it once.
+                    if child["id"] in seen:
+                        continue
+                    seen.add(child["id"])
+                    item["children"] = []
+                    next_frontier.append(item)
+                node["children"].append(item)
+        if truncated:
+            break
+        frontier = next_frontier
+    return root, truncated
+
+
+def summarize(node, depth, include_files=False):
+    """
+    Aggregate sizes and counts bottom-up and trim the tree to depth levels.
+
+    Returns:
+        dict: name, size, files, folders and (within depth) children.
+    """
+    summary = {"name": node["name"], "id": node["id"], "size": 0, "files": 0, "folders": 0}
+    children = []
+    for child in node["children"]:
+        if "children" in child:
+            sub = summarize(child, depth - 1, include_files)
+            summary["size"] += sub["size"]
+            summary["files"] += sub["files"]
+            summary["folders"] += sub["folders"] + 1
+            children.append(sub)
+        else:
+            summary["size"] += child["size"]
+            summary["files"] += 1
+            if include_files:
+                children.append({"name": child["name"], "id": child["id"], "size": child["size"]})
+    if depth > 0 and children:
+        summary["children"] = sorted(children, key=lambda c: -c["size"])
+    return summary
+
+
+def human_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
@@ -0,0 +1,116 @@
+import datetime
+
+from gclient.drive_store import FOLDER_MIME
+
+# -----------------------------------------
+# DRIVE QUERY BUILDER
+# -----------------------------------------
+# Builds files.list `q` expressions from typed filters so every literal is
+# escaped and filtering happens server-side, plus validated orderBy and
+# fields projections.
+
+MIME_ALIASES = {
+    "doc": "application/vnd.google-apps.document",
+    "document": "application/vnd.google-apps.document",
+    "sheet": "application/vnd.google-apps.spreadsheet",
+    "spreadsheet": "application/vnd.google-apps.spreadsheet",
+    "slides": "application/vnd.google-apps.presentation",
+    "presentation": "application/vnd.google-apps.presentation",
+    "form": "application/vnd.google-apps.form",
+    "drawing": "application/vnd.google-apps.drawing",
+    "folder": FOLDER_MIME,
+    "pdf": "application/pdf",
+}
+# Aliases matched by prefix (mimeType contains)
+MIME_PREFIXES = {"image": "image/", "video": "video/", "audio": "audio/", "text": "text/"}
+
+ORDER_KEYS = {
+    "createdTime", "folder", "modifiedByMeTime", "modifiedTime", "name", "name_natural",
+    "quotaBytesUsed", "recency", "sharedWithMeTime", "starred", "viewedByMeTime",
+}
+FILE_FIELDS = {
+    "id", "name", "mimeType", "size", "modifiedTime", "createdTime", "parents", "owners",
+    "starred", "webViewLink", "md5Checksum", "description", "shared",
+}
+DEFAULT_FIELDS = ["id", "name", "mimeType", "modifiedTime", "size"]
+
+
+def escape(value):
+    """Escape a literal for a Drive q expression."""
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+
+def _timestamp(value):
+    """A date or datetime string as the RFC 3339 form Drive expects."""
+    try:
+        parsed = datetime.datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}'. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS.")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.isoformat()
+
+
+def mime_clause(mime_type):
+    """A mimeType predicate for an alias ("pdf", "image", ...) or a literal MIME type."""
+    alias = mime_type.strip().lower()
+    if alias in MIME_PREFIXES:
+        return f"mimeType contains '{MIME_PREFIXES[alias]}'"
+    return f"mimeType = '{escape(MIME_ALIASES.get(alias, mime_type.strip()))}'"
+
+
+def build_query(name=None, name_contains=None, mime_type=None, full_text=None,
+                modified_after=None, modified_before=None, parent_id=None,
+                owner=None, starred=None, trashed=False):
+    """
+    Build a files.list q expression; every argument left as None is ignored.
+
+    Raises:
+        ValueError: For an unparseable date.
+    """
+    clauses = []
+    if name:
+        clauses.append(f"name = '{escape(name)}'")
+    if name_contains:
+        clauses.append(f"name contains '{escape(name_contains)}'")
+    if mime_type:
+        clauses.append(mime_clause(mime_type))
+    if full_text:
+        clauses.append(f"fullText contains '{escape(full_text)}'")
+    if modified_after:
+        clauses.append(f"modifiedTime > '{_timestamp(modified_after)}'")
+    if modified_before:
+        clauses.append(f"modifiedTime < '{_timestamp(modified_before)}'")
+    if parent_id:
+        clauses.append(f"'{escape(parent_id)}' in parents")
+    if owner:
+        clauses.append(f"'{escape(owner)}' in owners")
+    if starred is not None:
+        clauses.append(f"starred = {str(bool(starred)).lower()}")
+    if trashed is not None:
+        clauses.append(f"trashed = {str(bool(trashed)).lower()}")
+    return " and ".join(clauses)
+
+
+def build_order_by(order_by):
+    """Validate "modifiedTime desc,name" style orderBy strings."""
+    keys = []
+    for part in [p.strip() for p in (order_by or "").split(",") if p.strip()]:
+        key, _, direction = part.partition(" ")
+        direction = direction.strip().lower()
+        if key not in ORDER_KEYS or direction not in ("", "asc", "desc"):
+            raise ValueError(f"Unsupported orderBy '{part}'. Keys: {', '.join(sorted(ORDER_KEYS))}.")
+        keys.append(f"{key} desc" if direction == "desc" else key)
+    return ",".join(keys)
+
+
+def build_fields(fields):
+    """A files.list fields projection for the requested file fields."""
+    requested = [f.strip() for f in fields if f.strip()] if fields else DEFAULT_FIELDS
+    unknown = [f for f in requested if f not in FILE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unsupported fields {unknown}. Available: {', '.join(sorted(FILE_FIELDS))}.")
+    if "id" not in requested:
+        requested = ["id"] + requested
+    file_fields = ",".join("owners(emailAddress)" if f == "owners" else f for f in requested)
+    return f"nextPageToken,files({file_fields})"
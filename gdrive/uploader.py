@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import hashlib
+import pathlib
+import mimetypes
+import threading
+
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaFileUpload
+
+from gclient.drive_store import FILE_FIELDS
+
+# -----------------------------------------
+# RESUMABLE UPLOADS
+# -----------------------------------------
+# Files are streamed from disk in chunks over a resumable upload session.
+# The session is opened before any bytes are sent and its URI saved right
+# away, keyed by the local file's path, size and mtime (plus target name
+# and folder). An upload interrupted by a crash or a restart asks Drive
+# how many bytes it has (an empty PUT with "Content-Range: bytes */size")
+# and continues from there instead of starting over. A file that changed
+# on disk gets a new key and a fresh upload.
+
+SESSIONS_PATH = os.getcwd() + "/gdrive/credentials/.upload-sessions.json"
+# Drive keeps resumable sessions for about a week
+SESSION_MAX_AGE = 6 * 24 * 3600
+DEFAULT_CHUNK_MB = 8
+
+_sessions_lock = threading.Lock()
+
+
+def _load_sessions():
+    try:
+        with open(SESSIONS_PATH) as f:
+            sessions = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    now = time.time()
+    return {key: s for key, s in sessions.items() if now - s.get("created", 0) < SESSION_MAX_AGE}
+
+
+def _save_sessions(sessions):
+    pathlib.Path(os.path.dirname(SESSIONS_PATH)).mkdir(parents=True, exist_ok=True)
+    tmp = SESSIONS_PATH + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(sessions, f)
+    os.replace(tmp, SESSIONS_PATH)
+
+
+def _update_session(key, uri=None):
+    """Store (or with uri=None, forget) the session URI for key."""
+    with _sessions_lock:
+        sessions = _load_sessions()
+        if uri is None:
+            sessions.pop(key, None)
+        else:
+            sessions[key] = {"uri": uri, "created": sessions.get(key, {}).get("created", time.time())}
+        _save_sessions(sessions)
+
+
+def session_key(local_path, name, parent_id):
+    stat = os.stat(local_path)
+    raw = f"{os.path.abspath(local_path)}:{stat.st_size}:{stat.st_mtime_ns}:{name}:{parent_id}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _start_session(request):
+    """Open the resumable session for request and return its URI; no file bytes are sent yet."""
+    headers = dict(request.headers)
+    headers["X-Upload-Content-Type"] = request.resumable.mimetype()
+    headers["X-Upload-Content-Length"] = str(request.resumable.size())
+    headers["content-length"] = str(request.body_size)
+    resp, content = request.http.request(request.uri, method=request.method, body=request.body, headers=headers)
+    if resp.status != 200 or "location" not in resp:
+        raise HttpError(resp, content, uri=request.uri)
+    return resp["location"]
+
+
+def _query_session(request, uri):
+    """
+    Ask Drive how far an earlier session got.
+
+    Returns:
+        tuple: (bytes Drive has, file metadata when the upload had already completed, else None)
+    """
+    size = request.resumable.size()
+    resp, content = request.http.request(
+        uri, "PUT", headers={"Content-Range": f"bytes */{size}", "content-length": "0"}
+    )
+    if resp.status in (200, 201):
+        return size, request.postproc(resp, content)
+    if resp.status != 308:
+        raise HttpError(resp, content, uri=uri)
+    # "bytes=0-N" when Drive has N + 1 bytes; no header when it has none.
+    received = resp.get("range")
+    return (int(received.rsplit("-", 1)[1]) + 1 if received else 0), None
+
+
+def upload_file(drive, local_path, name, parent_id="", mime_type="",
+                chunk_size_mb=DEFAULT_CHUNK_MB, on_progress=None):
+    """
+    Upload a local file with a resumable, chunked session.
+
+    Args:
+        drive: The pooled Drive v3 client.
+        local_path (str): File to upload (streamed from disk, never read whole).
+        name (str): Name in Drive.
+        parent_id (str): Folder to upload into (empty = My Drive).
+        mime_type (str): Content type (guessed from the name when empty).
+        chunk_size_mb (int): Size of each upload request.
+        on_progress (callable): Called with the fraction uploaded after each chunk.
+
+    Returns:
+        tuple: (file metadata, resumed) where resumed tells whether an
+        earlier interrupted session was continued.
+    """
+    mime_type = mime_type or mimetypes.guess_type(name)[0] or "application/octet-stream"
+    chunk_size = max(1, int(chunk_size_mb)) * 1024 * 1024  # multiple of 256 KB as Drive requires
+    key = session_key(local_path, name, parent_id)
+    body = {"name": name}
+    if parent_id:
+        body["parents"] = [parent_id]
+
+    def new_request():
+        media = MediaFileUpload(local_path, mimetype=mime_type, chunksize=chunk_size, resumable=True)
+        return drive.files().create(body=body, media_body=media, fields=FILE_FIELDS)
+
+    def new_session():
+        request = new_request()
+        request.resumable_uri = _start_session(request)
+        _update_session(key, request.resumable_uri)
+        return request
+
+    request = new_request()
+    with _sessions_lock:
+        saved = _load_sessions().get(key)
+    response = None
+    resumed = False
+    if saved is not None:
+        try:
+            progress, response = _query_session(request, saved["uri"])
+            request.resumable_uri = saved["uri"]
+            request.resumable_progress = progress
+            resumed = True
+        except HttpError as e:
+            if e.resp.status not in (404, 410):
+                raise
+            # Session expired on Drive's side: start a new one below.
+    if not resumed:
+        request = new_session()
+
+    while response is None:
+        try:
+            status, response = request.next_chunk(num_retries=3)
+        except HttpError as e:
+            if e.resp.status in (404, 410):
+                # Session expired mid-upload: start over with a new one.
+                request = new_session()
+                resumed = False
+                continue
+            raise
+        if status is not None and on_progress:
+            on_progress(status.progress())
+
+    _update_session(key)
+    if on_progress:
+        on_progress(1.0)
+    return response, resumed
@@ -2,21 +2,25 @@ from google.adk.agents.llm_agent import LlmAgent
 from dotenv import load_dotenv
 import os
 import pathlib
-import asyncio
 import base64
 from google.genai import types
 from google.adk.models.google_llm import Gemini
 from email.message import EmailMessage
-from email import message_from_bytes
-from base64 import urlsafe_b64decode
 
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
 
+from gclient import execute, get_credentials, get_service, get_user_email, run_blocking
+from gclient.identity import credentials_fingerprint
+
+from . import mirror
+from .bulk_actions import DEFAULT_BULK_LIMIT, batch_delete, batch_modify, resolve_message_ids
+from .listing import DEFAULT_PAGE_SIZE, list_emails
+from .search import DEFAULT_SEARCH_RESULTS, build_search_query, search_messages
+from .message_body import DEFAULT_MAX_CHARS, extract_body, list_attachments, part_headers
+
 
 session_service = InMemorySessionService()
 # ============================================================
@@ -45,6 +49,15 @@ GMAIL_SCOPES = [
 
 PORT = 8080
 
+# get_emails type -> (required labels, excluded labels) for the local mirror
+MAILBOX_TYPE_LABELS = {
+    None: (["INBOX"], []),
+    "unread": (["INBOX", "UNREAD"], []),
+    "read": (["INBOX"], ["UNREAD"]),
+    "starred": (["INBOX", "STARRED"], []),
+    "important": (["INBOX", "IMPORTANT"], []),
+}
+
 
 # -----------------------------------------
 # AUTHENTICATION
@@ -81,31 +94,36 @@ def authenticate_and_save():
 
 
 def get_gmail_client():
-    """Return a Gmail API client."""
-    authenticate_and_save()
-    creds = Credentials.from_authorized_user_file(GMAIL_CREDENTIALS_PATH, GMAIL_SCOPES)
-    return build("gmail", "v1", credentials=creds)
+    """Return the pooled Gmail API client."""
+    return get_service("gmail", "v1", GMAIL_SCOPES, GMAIL_CREDENTIALS_PATH, authenticate_and_save)
+
+
+def get_sender_email(client):
+    """Return the signed-in address, calling getProfile only on a cache miss."""
+    creds = get_credentials(GMAIL_CREDENTIALS_PATH, GMAIL_SCOPES, authenticate_and_save)
+    return get_user_email(
+        creds, lambda: client.users().getProfile(userId="me").execute().get("emailAddress", "")
+    )
 
 
 # -----------------------------------------
 # EMAIL ACTIONS
 # -----------------------------------------
 
-def get_current_user_email_id():
-    client = get_gmail_client()
-    profile = client.users().getProfile(userId="me").execute()
-    print("Profile:",profile)
+async def get_current_user_email_id():
+    client = await run_blocking(get_gmail_client)
+    email_id = await run_blocking(get_sender_email, client)
     return {
         "content": {
-            "emailId": profile.get("emailAddress", "")
+            "emailId": email_id
         }
     }
 
 
 async def send_email(recipient_id: str, subject: str, message: str):
     """Send email using Gmail API."""
-    client = get_gmail_client()
-    sender_id = client.users().getProfile(userId="me").execute().get("emailAddress", "")
+    client = await run_blocking(get_gmail_client)
+    sender_id = await run_blocking(get_sender_email, client)
     print("sender ID:",sender_id)
     msg = EmailMessage()
     msg.set_content(message)
@@ -116,258 +134,142 @@ async def send_email(recipient_id: str, subject: str, message: str):
     raw_msg = base64.urlsafe_b64encode(msg.as_bytes()).decode()
     body = {"raw": raw_msg}
 
-    result = await asyncio.to_thread(
-        client.users().messages().send(userId="me", body=body).execute
-    )
+    result = await execute(lambda: client.users().messages().send(userId="me", body=body))
 
     return {"status": "success", "message_id": result["id"]}
 
 
-# async def fetch_metadata(client, msg_id):
-#     detail = await asyncio.to_thread(
-#         client.users().messages().get(
-#             userId="me", 
-#             id=msg_id,
-#             format="metadata",
-#             metadataHeaders=["Subject", "From"]
-#         ).execute
-#     )
-#     headers = {h["name"]: h["value"] for h in detail["payload"]["headers"]}
-#     return {"subject": headers.get("Subject", ""), "from": headers.get("From", "")}
-
+def _list_mailbox(client, labels, exclude_labels, query, max_emails, page_size):
+    """Answer from the local mirror, or go live when it is stale."""
+    if labels is not None:
+        creds = get_credentials(GMAIL_CREDENTIALS_PATH, GMAIL_SCOPES, authenticate_and_save)
+        emails = mirror.list_labeled(client, credentials_fingerprint(creds), labels, exclude_labels, max_emails)
+        if emails is not None:
+            return emails
+    return list_emails(client, query, max_emails, page_size)
 
 
-async def get_emails(type: str = None, max_emails=10, batch_size=5):
+async def get_emails(type: str = None, max_emails: int = 10, page_size: int = DEFAULT_PAGE_SIZE):
     """Fetch recent emails (subject, from, id) in list format."""
-    client = get_gmail_client()
     query = f"in:inbox is:{type}" if type else "in:inbox"
-    results = []
-    next_page_token = None
-    fetched = 0
-    while fetched < max_emails:
-        response = client.users().messages().list(
-            userId="me", q=query, maxResults=batch_size,
-            pageToken=next_page_token
-        ).execute()
-        messages = response.get("messages", [])
-        for msg in messages:
-            detail = client.users().messages().get(
-                userId="me", id=msg["id"], format="metadata",
-                metadataHeaders=["Subject", "From"]
-            ).execute()
-            headers = {h["name"]: h["value"] for h in detail["payload"]["headers"]}
-            results.append({
-                "id": msg["id"],
-                "subject": headers.get("Subject", ""),
-                "from": headers.get("From", "")
-            })
-        fetched += len(messages)
-        next_page_token = response.get("nextPageToken")
-        if not next_page_token or fetched >= max_emails:
-            break
-    return results[:max_emails]
-
-async def get_draft_mail(max_emails=10, batch_size=5):
+    labels, exclude_labels = MAILBOX_TYPE_LABELS.get(type.lower() if type else None, (None, None))
+    client = await run_blocking(get_gmail_client)
+    return await run_blocking(_list_mailbox, client, labels, exclude_labels, query, max_emails, page_size)
+
+
+async def get_draft_mail(max_emails: int = 10, page_size: int = DEFAULT_PAGE_SIZE):
     """Fetch recent draft emails (subject, from, id) in list format."""
-    client = get_gmail_client()
-    query = "in:draft"
-    results = []
-    next_page_token = None
-    fetched = 0
-    while fetched < max_emails:
-        response = client.users().messages().list(
-            userId="me", q=query, maxResults=batch_size,
-            pageToken=next_page_token
-        ).execute()
-        messages = response.get("messages", [])
-        for msg in messages:
-            detail = client.users().messages().get(
-                userId="me", id=msg["id"], format="metadata",
-                metadataHeaders=["Subject", "From"]
-            ).execute()
-            headers = {h["name"]: h["value"] for h in detail["payload"]["headers"]}
-            results.append({
-                "id": msg["id"],
-                "subject": headers.get("Subject", ""),
-                "from": headers.get("From", "")
-            })
-        fetched += len(messages)
-        next_page_token = response.get("nextPageToken")
-        if not next_page_token or fetched >= max_emails:
-            break
-    return results[:max_emails]
-
-
-async def get_trash_mail(max_emails=10, batch_size=5):
+    client = await run_blocking(get_gmail_client)
+    return await run_blocking(_list_mailbox, client, ["DRAFT"], [], "in:draft", max_emails, page_size)
+
+
+async def get_trash_mail(max_emails: int = 10, page_size: int = DEFAULT_PAGE_SIZE):
     """Fetch recent trash emails (subject, from, id) in list format."""
-    client = get_gmail_client()
-    query = "in:trash"
-    results = []
-    next_page_token = None
-    fetched = 0
-    while fetched < max_emails:
-        response = client.users().messages().list(
-            userId="me", q=query, maxResults=batch_size,
-            pageToken=next_page_token
-        ).execute()
-        messages = response.get("messages", [])
-        for msg in messages:
-            detail = client.users().messages().get(
-                userId="me", id=msg["id"], format="metadata",
-                metadataHeaders=["Subject", "From"]
-            ).execute()
-            headers = {h["name"]: h["value"] for h in detail["payload"]["headers"]}
-            results.append({
-                "id": msg["id"],
-                "subject": headers.get("Subject", ""),
-                "from": headers.get("From", "")
-            })
-        fetched += len(messages)
-        next_page_token = response.get("nextPageToken")
-        if not next_page_token or fetched >= max_emails:
-            break
-    return results[:max_emails]
-
-
-async def get_spam_mail(max_emails=10, batch_size=5):
+    client = await run_blocking(get_gmail_client)
+    return await run_blocking(_list_mailbox, client, ["TRASH"], [], "in:trash", max_emails, page_size)
+
+
+async def get_spam_mail(max_emails: int = 10, page_size: int = DEFAULT_PAGE_SIZE):
     """Fetch recent spam emails (subject, from, id) in list format."""
-    client = get_gmail_client()
-    query = "in:spam"
-    results = []
-    next_page_token = None
-    fetched = 0
-    while fetched < max_emails:
-        response = client.users().messages().list(
-            userId="me", q=query, maxResults=batch_size,
-            pageToken=next_page_token
-        ).execute()
-        messages = response.get("messages", [])
-        for msg in messages:
-            detail = client.users().messages().get(
-                userId="me", id=msg["id"], format="metadata",
-                metadataHeaders=["Subject", "From"]
-            ).execute()
-            headers = {h["name"]: h["value"] for h in detail["payload"]["headers"]}
-            results.append({
-                "id": msg["id"],
-                "subject": headers.get("Subject", ""),
-                "from": headers.get("From", "")
-            })
-        fetched += len(messages)
-        next_page_token = response.get("nextPageToken")
-        if not next_page_token or fetched >= max_emails:
-            break
-    return results[:max_emails]
-
-
-# async def get_emails(type: str = None, max_emails=50, batch_size=5):
-#     """Efficiently fetch subject/from for each email via pagination. Present in list format."""
-#     client = get_gmail_client()
-#     if type:
-#         query = f"in:inbox is:{type}"
-#     else:
-#         query = "in:inbox"
-#     results = []
-#     next_page_token = None
-#     fetched = 0
-#     while fetched < max_emails:
-#         response = client.users().messages().list(
-#             userId="me", q=query, maxResults=batch_size,
-#             pageToken=next_page_token
-#         ).execute()
-#         messages = response.get("messages", [])
-#         print("Messages batch:",messages)
-#         for msg in messages:
-#             detail = client.users().messages().get(
-#                 userId="me", id=msg["id"], format="metadata",
-#                 metadataHeaders=["Subject", "From"]
-#             ).execute()
-#             headers = {h["name"]: h["value"] for h in detail["payload"]["headers"]}
-#             results.append({"subject": headers.get("Subject", ""), "from": headers.get("From", "")})
-#         # tasks = [fetch_metadata(client, msg["id"]) for msg in messages]
-#         # batch_results = await asyncio.gather(*tasks)
-#         # results.extend(batch_results)
-#         # print(f"Fetched {len(batch_results)} emails, total so far: {len(results)}")
-#         fetched += len(messages)
-#         next_page_token = response.get("nextPageToken")
-#         if not next_page_token or fetched >= max_emails:
-#             break
-#     return results[:max_emails]
-
-# async def get_draft_mail(max_emails=50, batch_size=5):
-#     """Fetch inbox email message IDs. Present subject and from address in list format.  Present in list format."""
-#     client = get_gmail_client()
-#     query = f"in:draft"
-#     # print("Query:",query)
-#     # print("Fetching emails...",client.users().messages().list(userId="me", q=query, maxResults=10).execute())
-#     results = []
-#     next_page_token = None
-#     fetched = 0
-#     while fetched < max_emails:
-#         response = client.users().messages().list(
-#             userId="me", q=query, maxResults=batch_size,
-#             pageToken=next_page_token
-#         ).execute()
-#         messages = response.get("messages", [])
-#         print("Messages batch:",messages)
-#         for msg in messages:
-#             detail = client.users().messages().get(
-#                 userId="me", id=msg["id"], format="metadata",
-#                 metadataHeaders=["Subject", "From"]
-#             ).execute()
-#             headers = {h["name"]: h["value"] for h in detail["payload"]["headers"]}
-#             results.append({"subject": headers.get("Subject", ""), "from": headers.get("From", "")})
-#         # tasks = [fetch_metadata(client, msg["id"]) for msg in messages]
-#         # batch_results = await asyncio.gather(*tasks)
-#         # results.extend(batch_results)
-#         # print(f"Fetched {len(batch_results)} emails, total so far: {len(results)}")
-#         fetched += len(messages)
-#         next_page_token = response.get("nextPageToken")
-#         if not next_page_token or fetched >= max_emails:
-#             break
-#     return results[:max_emails]
-
-
-async def read_email_content(email_id: str):
-    """Read full email content."""
-    client = get_gmail_client()
-
-    msg = client.users().messages().get(userId="me", id=email_id, format="raw").execute()
-
-    raw = urlsafe_b64decode(msg["raw"])
-    mime_msg = message_from_bytes(raw)
-
-    # Extract body
-    body = None
-    if mime_msg.is_multipart():
-        for part in mime_msg.walk():
-            if part.get_content_type() == "text/plain":
-                body = part.get_payload(decode=True).decode()
-                break
-    else:
-        body = mime_msg.get_payload(decode=True).decode()
+    client = await run_blocking(get_gmail_client)
+    return await run_blocking(_list_mailbox, client, ["SPAM"], [], "in:spam", max_emails, page_size)
+
+
+async def read_email_content(email_id: str, max_chars: int = DEFAULT_MAX_CHARS):
+    """Read an email's headers and text body (truncated to max_chars)."""
+    client = await run_blocking(get_gmail_client)
+
+    msg = await execute(
+        lambda: client.users().messages().get(userId="me", id=email_id, format="full", fields="id,payload")
+    )
+    payload = msg.get("payload", {})
+    headers = part_headers(payload)
+    body, truncated = await run_blocking(extract_body, client, email_id, payload, max_chars)
 
     return {
-        "subject": mime_msg.get("subject", ""),
-        "from": mime_msg.get("from", ""),
-        "to": mime_msg.get("to", ""),
-        "date": mime_msg.get("date", ""),
+        "subject": headers.get("subject", ""),
+        "from": headers.get("from", ""),
+        "to": headers.get("to", ""),
+        "date": headers.get("date", ""),
         "content": body,
+        "truncated": truncated,
+        "attachments": list_attachments(payload),
     }
 
 
 async def delete_email(message_id: str):
     """Move email to trash."""
-    client = get_gmail_client()
-    client.users().messages().trash(userId="me", id=message_id).execute()
+    client = await run_blocking(get_gmail_client)
+    await execute(lambda: client.users().messages().trash(userId="me", id=message_id))
+    await run_blocking(mirror.add_labels, [message_id], ["TRASH"])
     return "Email deleted successfully."
 
 async def delete__trash_email(message_id: str):
     """Move email to trash."""
-    client = get_gmail_client()
-    client.users().messages().delete(userId="me", id=message_id).execute()
+    client = await run_blocking(get_gmail_client)
+    await execute(lambda: client.users().messages().delete(userId="me", id=message_id))
+    await run_blocking(mirror.remove_messages, [message_id])
     return "Email deleted successfully."
 
+def _bulk_result(action, ids, done, chunks):
+    return {
+        "status": "success" if len(done) == len(ids) else "partial" if done else "error",
+        "message": f"{action} {len(done)} of {len(ids)} email(s).",
+        "chunks": chunks,
+    }
+
+
+async def bulk_trash_emails(message_ids: list[str] = None, query: str = "",
+                            max_emails: int = DEFAULT_BULK_LIMIT):
+    """Move many emails to trash at once, by id list and/or Gmail search query."""
+    client = await run_blocking(get_gmail_client)
+    ids = await run_blocking(resolve_message_ids, client, message_ids, query, max_emails)
+    if not ids:
+        return {"status": "error", "message": "No matching emails found.", "chunks": []}
+    done, chunks = await run_blocking(batch_modify, client, ids, add_labels=["TRASH"])
+    await run_blocking(mirror.add_labels, done, ["TRASH"])
+    return _bulk_result("Moved to trash", ids, done, chunks)
+
+
+async def bulk_delete_emails(message_ids: list[str] = None, query: str = "",
+                             max_emails: int = DEFAULT_BULK_LIMIT):
+    """Permanently delete many emails at once, by id list and/or Gmail search query."""
+    client = await run_blocking(get_gmail_client)
+    ids = await run_blocking(resolve_message_ids, client, message_ids, query, max_emails)
+    if not ids:
+        return {"status": "error", "message": "No matching emails found.", "chunks": []}
+    done, chunks = await run_blocking(batch_delete, client, ids)
+    await run_blocking(mirror.remove_messages, done)
+    return _bulk_result("Permanently deleted", ids, done, chunks)
+
+
+async def search_emails(sender: str = "", recipient: str = "", subject: str = "",
+                        after: str = "", before: str = "", has_attachment: bool = False,
+                        label: str = "", text: str = "",
+                        max_results: int = DEFAULT_SEARCH_RESULTS, cursor: str = ""):
+    """
+    Search the whole mailbox on Gmail's side.
+
+    Args:
+        sender / recipient: Address or name to match in From / To.
+        subject: Words that must appear in the subject.
+        after / before: Date range in YYYY-MM-DD format.
+        has_attachment: Only messages with attachments.
+        label: Gmail label name, e.g. "work".
+        text: Free text matched anywhere in the message.
+        max_results: Page size.
+        cursor: next_cursor from a previous call, to get the next page.
+    """
+    try:
+        query = build_search_query(sender, recipient, subject, after, before,
+                                   has_attachment, label, text)
+    except ValueError as e:
+        return {"status": "error", "message": str(e), "emails": [], "next_cursor": ""}
+    client = await run_blocking(get_gmail_client)
+    emails, next_cursor = await run_blocking(search_messages, client, query, max_results, cursor)
+    return {"status": "success", "query": query, "emails": emails, "next_cursor": next_cursor}
+
+
 def find_email_by_subject_or_index(email_list, subject=None, index=None):
     if subject:
         for item in email_list:
@@ -386,7 +288,10 @@ def create_gmail_agent():
     name="gmail",
     instruction=(
         "Assist the user with Gmail operations: read, send, delete emails, "
-        "and get current user info."
+        "and get current user info. To trash or delete more than one email, "
+        "use bulk_trash_emails or bulk_delete_emails in a single call. "
+        "To find a specific message, use search_emails instead of listing mail; "
+        "pass next_cursor back to get more results."
     ),
     tools=[
         get_current_user_email_id,
@@ -395,9 +300,12 @@ def create_gmail_agent():
         get_trash_mail,
         get_draft_mail,
         get_spam_mail,
+        search_emails,
         read_email_content,
         delete_email,
         delete__trash_email,
+        bulk_trash_emails,
+        bulk_delete_emails,
         find_email_by_subject_or_index,
     ],
 )
@@ -0,0 +1,62 @@
+from .listing import MAX_PAGE_SIZE, list_message_ids
+
+# -----------------------------------------
+# BULK MESSAGE MUTATIONS
+# -----------------------------------------
+# messages.batchModify and messages.batchDelete accept up to 1000 ids per
+# call, so clearing a folder is a handful of requests, not one per message.
+
+BULK_CHUNK_SIZE = 1000
+DEFAULT_BULK_LIMIT = 1000
+
+
+def resolve_message_ids(client, message_ids=None, query="", max_emails=DEFAULT_BULK_LIMIT):
+    """Merge explicit ids with the ids matching a Gmail query (deduplicated)."""
+    ids = list(message_ids or [])
+    if query:
+        found, _ = list_message_ids(client, query, max_emails, page_size=MAX_PAGE_SIZE)
+        ids.extend(found)
+    return list(dict.fromkeys(ids))
+
+
+def run_in_chunks(message_ids, make_request):
+    """
+    Execute one bulk request per chunk of ids.
+
+    Args:
+        message_ids (list): Ids to act on.
+        make_request (callable): Builds the HttpRequest for a list of ids.
+
+    Returns:
+        tuple: (ids that succeeded, per-chunk result dicts)
+    """
+    done = []
+    chunks = []
+    for number, start in enumerate(range(0, len(message_ids), BULK_CHUNK_SIZE), 1):
+        chunk = message_ids[start:start + BULK_CHUNK_SIZE]
+        try:
+            make_request(chunk).execute()
+            done.extend(chunk)
+            chunks.append({"chunk": number, "count": len(chunk), "status": "success"})
+        except Exception as e:
+            chunks.append({"chunk": number, "count": len(chunk), "status": "error", "message": str(e)})
+    return done, chunks
+
+
+def batch_modify(client, message_ids, add_labels=(), remove_labels=()):
+    """Add/remove labels on many messages with messages.batchModify."""
+    return run_in_chunks(
+        message_ids,
+        lambda chunk: client.users().messages().batchModify(
+            userId="me",
+            body={"ids": chunk, "addLabelIds": list(add_labels), "removeLabelIds": list(remove_labels)},
+        ),
+    )
+
+
+def batch_delete(client, message_ids):
+    """Permanently delete many messages with messages.batchDelete."""
+    return run_in_chunks(
+        message_ids,
+        lambda chunk: client.users().messages().batchDelete(userId="me", body={"ids": chunk}),
+    )
@@ -0,0 +1,77 @@
+from gclient import execute_batch
+
+# -----------------------------------------
+# MESSAGE LISTING ENGINE
+# -----------------------------------------
+# One messages.list call per page of ids, then one HTTP batch call per
+# 50 ids for the metadata, instead of one messages.get per message.
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500  # Gmail's hard limit for messages.list
+METADATA_HEADERS = ["Subject", "From"]
+
+# Partial-response projections: only ids from list, only what the tools use from get.
+LIST_FIELDS = "nextPageToken,messages/id"
+METADATA_FIELDS = "id,threadId,labelIds,internalDate,snippet,payload/headers"
+
+
+def list_message_ids(client, query, max_emails, page_size=DEFAULT_PAGE_SIZE, page_token=None,
+                     include_spam_trash=False):
+    """
+    Collect up to max_emails message ids matching a Gmail query.
+
+    Returns:
+        tuple: (list of ids, next page token or None)
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    ids = []
+    while len(ids) < max_emails:
+        response = client.users().messages().list(
+            userId="me", q=query,
+            maxResults=min(page_size, max_emails - len(ids)),
+            pageToken=page_token, includeSpamTrash=include_spam_trash,
+            fields=LIST_FIELDS
+        ).execute()
+        ids.extend(msg["id"] for msg in response.get("messages", []))
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            break
+    return ids[:max_emails], page_token
+
+
+def summarize_message(detail):
+    """Reduce a metadata-format message to the fields the tools return."""
+    headers = {h["name"]: h["value"] for h in detail.get("payload", {}).get("headers", [])}
+    return {
+        "id": detail["id"],
+        "subject": headers.get("Subject", ""),
+        "from": headers.get("From", "")
+    }
+
+
+def fetch_metadata(client, message_ids, headers=METADATA_HEADERS):
+    """Fetch metadata for many messages through Gmail HTTP batch requests."""
+    requests = [
+        client.users().messages().get(
+            userId="me", id=msg_id, format="metadata",
+            metadataHeaders=headers, fields=METADATA_FIELDS
+        )
+        for msg_id in message_ids
+    ]
+    details = []
+    for request, (detail, error) in zip(requests, execute_batch(client, requests)):
+        if error is not None:
+            # A rate-limited batch item is retried once on its own.
+            try:
+                detail = request.execute()
+            except Exception as e:
+                print(f"Skipping message {request.uri}: {e}")
+                continue
+        details.append(detail)
+    return details
+
+
+def list_emails(client, query, max_emails=10, page_size=DEFAULT_PAGE_SIZE):
+    """List recent messages matching a query as (subject, from, id) dicts."""
+    ids, _ = list_message_ids(client, query, max_emails, page_size)
+    return [summarize_message(detail) for detail in fetch_metadata(client, ids)]
@@ -0,0 +1,145 @@
+import os
+import re
+import base64
+from email.message import Message
+from html.parser import HTMLParser
+
+# -----------------------------------------
+# MESSAGE BODY EXTRACTION
+# -----------------------------------------
+# Messages are fetched with format="full", which returns the MIME tree with
+# attachment payloads left out. Only the first inline text part is decoded,
+# and only as many bytes as the character budget can use, so memory does
+# not grow with the size of the message or its attachments.
+
+DEFAULT_MAX_CHARS = int(os.getenv("GMAIL_BODY_MAX_CHARS", "20000"))
+
+# UTF-8 needs up to 4 bytes per character; HTML also carries markup.
+BYTES_PER_CHAR = 4
+HTML_MARKUP_FACTOR = 4
+
+
+def part_headers(part):
+    return {h["name"].lower(): h["value"] for h in part.get("headers", [])}
+
+
+def _walk(part):
+    yield part
+    for child in part.get("parts", []) or []:
+        yield from _walk(child)
+
+
+def _is_attachment(part):
+    disposition = part_headers(part).get("content-disposition", "")
+    return bool(part.get("filename")) or disposition.lower().startswith("attachment")
+
+
+def list_attachments(payload):
+    """Name, type and size of every attachment, without downloading any of them."""
+    return [
+        {
+            "filename": part.get("filename", ""),
+            "mimeType": part.get("mimeType", ""),
+            "size": part.get("body", {}).get("size", 0),
+        }
+        for part in _walk(payload)
+        if _is_attachment(part)
+    ]
+
+
+def _charset(part):
+    msg = Message()
+    content_type = part_headers(part).get("content-type")
+    if content_type:
+        msg["Content-Type"] = content_type
+    return msg.get_content_charset() or "utf-8"
+
+
+def _decode_prefix(data, max_bytes):
+    """Decode at most max_bytes from base64url data without decoding the rest."""
+    chunk = data[: ((max_bytes + 2) // 3) * 4]
+    chunk += "=" * (-len(chunk) % 4)
+    return base64.urlsafe_b64decode(chunk)[:max_bytes]
+
+
+class _HTMLText(HTMLParser):
+    SKIP_TAGS = {"script", "style", "head", "title"}
+    BLOCK_TAGS = {"p", "div", "br", "tr", "li", "ul", "ol", "table", "blockquote",
+                  "h1", "h2", "h3", "h4", "h5", "h6", "hr"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chunks = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag in self.BLOCK_TAGS:
+            self.chunks.append("\n- " if tag == "li" else "\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in self.BLOCK_TAGS:
+            self.chunks.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.chunks.append(data)
+
+
+def html_to_text(html):
+    """Convert an HTML body to readable plain text."""
+    parser = _HTMLText()
+    parser.feed(html)
+    parser.close()
+    text = re.sub(r"[ \t\r\f\v]+", " ", "".join(parser.chunks))
+    text = re.sub(r" *\n *", "\n", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def _part_bytes(client, message_id, part, max_bytes):
+    body = part.get("body", {})
+    data = body.get("data")
+    if data is None and body.get("attachmentId"):
+        # Large text parts are served separately, like attachments.
+        data = client.users().messages().attachments().get(
+            userId="me", messageId=message_id, id=body["attachmentId"]
+        ).execute().get("data", "")
+    return _decode_prefix(data or "", max_bytes), body.get("size", 0) > max_bytes
+
+
+def extract_body(client, message_id, payload, max_chars=DEFAULT_MAX_CHARS):
+    """
+    Extract a readable text body from a format="full" message payload.
+
+    Prefers the first inline text/plain part and falls back to text/html
+    converted to text. Attachments are never downloaded.
+
+    Returns:
+        tuple: (text or None, True when the text was truncated)
+    """
+    for mime_type in ("text/plain", "text/html"):
+        part = next(
+            (p for p in _walk(payload)
+             if p.get("mimeType") == mime_type and not _is_attachment(p)),
+            None,
+        )
+        if part is None:
+            continue
+
+        max_bytes = max_chars * BYTES_PER_CHAR
+        if mime_type == "text/html":
+            max_bytes *= HTML_MARKUP_FACTOR
+        raw, truncated = _part_bytes(client, message_id, part, max_bytes)
+        try:
+            text = raw.decode(_charset(part), errors="replace")
+        except LookupError:
+            text = raw.decode("utf-8", errors="replace")
+        if mime_type == "text/html":
+            text = html_to_text(text)
+        if len(text) > max_chars:
+            text, truncated = text[:max_chars], True
+        return text, truncated
+    return None, False
@@ -0,0 +1,208 @@
+import os
+import time
+
+from gclient.local_db import Syncer, connect, get_state, set_state
+from .listing import fetch_metadata, list_message_ids, summarize_message
+
+# -----------------------------------------
+# LOCAL MAILBOX MIRROR
+# -----------------------------------------
+# Message metadata (subject, sender, date, labels) is mirrored into SQLite
+# and kept current with users.history.list from the last stored historyId.
+# Listing tools answer from the mirror; an incremental sync (one history
+# call) runs when the mirror is older than MIRROR_MAX_AGE seconds, and the
+# tools fall back to live Gmail queries whenever the mirror cannot be
+# brought up to date.
+
+MIRROR_PATH = os.getcwd() + "/gmail/credentials/.gmail-mirror.sqlite3"
+MIRROR_MAX_AGE = int(os.getenv("GMAIL_MIRROR_MAX_AGE", "60"))
+BOOTSTRAP_LIMIT = int(os.getenv("GMAIL_MIRROR_BOOTSTRAP_LIMIT", "2000"))
+
+HISTORY_TYPES = ["messageAdded", "messageDeleted", "labelAdded", "labelRemoved"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY,
+    thread_id TEXT,
+    subject TEXT,
+    sender TEXT,
+    internal_date INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_messages_date ON messages(internal_date DESC);
+CREATE TABLE IF NOT EXISTS message_labels (
+    label_id TEXT,
+    message_id TEXT,
+    PRIMARY KEY (label_id, message_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_message_labels_message ON message_labels(message_id);
+"""
+
+
+def _connect():
+    return connect(MIRROR_PATH, SCHEMA)
+
+
+def _store_messages(conn, details):
+    for detail in details:
+        summary = summarize_message(detail)
+        conn.execute(
+            "INSERT OR REPLACE INTO messages (id, thread_id, subject, sender, internal_date) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (detail["id"], detail.get("threadId"), summary["subject"], summary["from"],
+             int(detail.get("internalDate", 0))),
+        )
+        _replace_labels(conn, detail["id"], detail.get("labelIds", []))
+
+
+def _replace_labels(conn, message_id, label_ids):
+    conn.execute("DELETE FROM message_labels WHERE message_id = ?", (message_id,))
+    conn.executemany(
+        "INSERT OR IGNORE INTO message_labels (label_id, message_id) VALUES (?, ?)",
+        [(label_id, message_id) for label_id in label_ids],
+    )
+
+
+def _delete_messages(conn, message_ids):
+    params = [(message_id,) for message_id in message_ids]
+    conn.executemany("DELETE FROM messages WHERE id = ?", params)
+    conn.executemany("DELETE FROM message_labels WHERE message_id = ?", params)
+
+
+# -----------------------------------------
+# SYNC
+# -----------------------------------------
+def _bootstrap(client):
+    """Rebuild the mirror from the newest BOOTSTRAP_LIMIT messages."""
+    # Take the historyId first so nothing that happens during the listing is lost.
+    history_id = client.users().getProfile(userId="me").execute()["historyId"]
+    ids, next_token = list_message_ids(
+        client, "", BOOTSTRAP_LIMIT, page_size=500, include_spam_trash=True
+    )
+    details = fetch_metadata(client, ids)
+    with _connect() as conn:
+        conn.execute("DELETE FROM messages")
+        conn.execute("DELETE FROM message_labels")
+        _store_messages(conn, details)
+        set_state(conn, history_id=history_id, synced_at=time.time(),
+                   truncated=int(bool(next_token)))
+    print(f"Gmail mirror bootstrapped with {len(details)} messages")
+
+
+def _sync_history(client, start_history_id):
+    """Apply users.history.list changes since start_history_id."""
+    changes = {}  # message id -> list of current label ids, or None when deleted
+    added = set()
+    history_id = start_history_id
+    page_token = None
+    while True:
+        response = client.users().history().list(
+            userId="me", startHistoryId=start_history_id,
+            historyTypes=HISTORY_TYPES, pageToken=page_token
+        ).execute()
+        for record in response.get("history", []):
+            for item in record.get("messagesAdded", []):
+                message = item["message"]
+                added.add(message["id"])
+                changes[message["id"]] = message.get("labelIds", [])
+            for item in record.get("messagesDeleted", []):
+                changes[item["message"]["id"]] = None
+            for key in ("labelsAdded", "labelsRemoved"):
+                for item in record.get(key, []):
+                    message = item["message"]
+                    changes[message["id"]] = message.get("labelIds", [])
+        history_id = response.get("historyId", history_id)
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            break
+
+    deleted = [message_id for message_id, labels in changes.items() if labels is None]
+    with _connect() as conn:
+        known = {
+            message_id for message_id in changes
+            if conn.execute("SELECT 1 FROM messages WHERE id = ?", (message_id,)).fetchone()
+        }
+    # New messages, and relabelled ones the mirror has never seen, need their headers.
+    missing = [
+        message_id for message_id, labels in changes.items()
+        if labels is not None and (message_id in added or message_id not in known)
+    ]
+    details = fetch_metadata(client, missing)
+
+    with _connect() as conn:
+        _delete_messages(conn, deleted)
+        _store_messages(conn, details)
+        for message_id, labels in changes.items():
+            if labels is not None and message_id in known and message_id not in added:
+                _replace_labels(conn, message_id, labels)
+        set_state(conn, history_id=history_id, synced_at=time.time())
+
+
+# Gmail keeps history for about a week; an older historyId returns 404.
+_syncer = Syncer(MIRROR_PATH, SCHEMA, "Gmail mirror", "history_id", _bootstrap, _sync_history, (404,))
+
+
+def ensure_fresh(client, fingerprint, max_age=MIRROR_MAX_AGE):
+    """
+    Bring the mirror up to date if it is older than max_age seconds.
+
+    Returns:
+        bool: True when the mirror can answer queries right now.
+    """
+    return _syncer.ensure_fresh(client, fingerprint, max_age)
+
+
+# -----------------------------------------
+# QUERIES AND LOCAL WRITES
+# -----------------------------------------
+def list_labeled(client, fingerprint, labels, exclude_labels=(), max_emails=10):
+    """
+    List the newest mirrored messages carrying every label in labels.
+
+    Returns:
+        list | None: (subject, from, id) dicts, or None when the caller
+        should fall back to a live Gmail query.
+    """
+    if not ensure_fresh(client, fingerprint):
+        return None
+
+    # Gmail hides spam and trash from every other view.
+    exclude_labels = set(exclude_labels)
+    if not {"SPAM", "TRASH"} & set(labels):
+        exclude_labels |= {"SPAM", "TRASH"}
+
+    where = []
+    params = []
+    for label_id in labels:
+        where.append("EXISTS (SELECT 1 FROM message_labels l WHERE l.message_id = m.id AND l.label_id = ?)")
+        params.append(label_id)
+    for label_id in exclude_labels:
+        where.append("NOT EXISTS (SELECT 1 FROM message_labels l WHERE l.message_id = m.id AND l.label_id = ?)")
+        params.append(label_id)
+    sql = "SELECT id, subject, sender FROM messages m"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY internal_date DESC LIMIT ?"
+
+    with _connect() as conn:
+        rows = conn.execute(sql, params + [max_emails]).fetchall()
+        truncated = get_state(conn, "truncated") == "1"
+
+    # A partial mirror cannot prove that older matches do not exist.
+    if truncated and len(rows) < max_emails:
+        return None
+    return [{"id": row[0], "subject": row[1], "from": row[2]} for row in rows]
+
+
+def add_labels(message_ids, label_ids):
+    """Apply a label change made through the API before the next sync sees it."""
+    with _connect() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO message_labels (label_id, message_id) VALUES (?, ?)",
+            [(label_id, message_id) for message_id in message_ids for label_id in label_ids],
+        )
+
+
+def remove_messages(message_ids):
+    """Drop permanently deleted messages from the mirror."""
+    with _connect() as conn:
+        _delete_messages(conn, message_ids)
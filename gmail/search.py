@@ -0,0 +1,76 @@
+import re
+from datetime import datetime
+
+from .listing import fetch_metadata, list_message_ids
+
+# -----------------------------------------
+# SERVER-SIDE SEARCH
+# -----------------------------------------
+# Structured criteria are compiled into Gmail's q syntax so the filtering
+# happens on Gmail's side; results come back one page at a time with a
+# cursor (the messages.list page token).
+
+SEARCH_HEADERS = ["Subject", "From", "To", "Date"]
+DEFAULT_SEARCH_RESULTS = 20
+
+
+def _quote(value):
+    value = value.replace('"', "").strip()
+    return f'"{value}"' if re.search(r"[\s(){}:]", value) else value
+
+
+def _gmail_date(value):
+    """Gmail's after:/before: operators take YYYY/MM/DD."""
+    for fmt in ("%Y-%m-%d", "%Y/%m/%d"):
+        try:
+            return datetime.strptime(value.strip(), fmt).strftime("%Y/%m/%d")
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date: {value}. Use YYYY-MM-DD format.")
+
+
+def build_search_query(sender="", recipient="", subject="", after="", before="",
+                       has_attachment=False, label="", text=""):
+    """Compile structured search criteria into a Gmail q string."""
+    terms = []
+    if sender:
+        terms.append(f"from:{_quote(sender)}")
+    if recipient:
+        terms.append(f"to:{_quote(recipient)}")
+    if subject:
+        terms.append(f"subject:{_quote(subject)}")
+    if after:
+        terms.append(f"after:{_gmail_date(after)}")
+    if before:
+        terms.append(f"before:{_gmail_date(before)}")
+    if has_attachment:
+        terms.append("has:attachment")
+    if label:
+        terms.append(f"label:{_quote(label)}")
+    if text:
+        terms.append(text.strip())
+    return " ".join(terms)
+
+
+def search_messages(client, query, max_results=DEFAULT_SEARCH_RESULTS, cursor=""):
+    """
+    Run one page of a Gmail search.
+
+    Returns:
+        tuple: (list of result dicts, cursor for the next page or "")
+    """
+    ids, next_token = list_message_ids(
+        client, query, max_results, page_size=max_results, page_token=cursor or None
+    )
+    results = []
+    for detail in fetch_metadata(client, ids, headers=SEARCH_HEADERS):
+        headers = {h["name"]: h["value"] for h in detail.get("payload", {}).get("headers", [])}
+        results.append({
+            "id": detail["id"],
+            "subject": headers.get("Subject", ""),
+            "from": headers.get("From", ""),
+            "to": headers.get("To", ""),
+            "date": headers.get("Date", ""),
+            "snippet": detail.get("snippet", ""),
+        })
+    return results, next_token or ""
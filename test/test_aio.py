@@ -0,0 +1,111 @@
+import json
+import time
+import asyncio
+import threading
+
+import httplib2
+import pytest
+from googleapiclient.discovery import build_from_document
+
+from gclient import aio, pool
+
+# Minimal offline discovery document: one GET method, items.get(id).
+DISCOVERY = {
+    "kind": "discovery#restDescription",
+    "discoveryVersion": "v1",
+    "id": "stub:v1",
+    "name": "stub",
+    "version": "v1",
+    "rootUrl": "https://stub.googleapis.com/",
+    "servicePath": "stub/v1/",
+    "baseUrl": "https://stub.googleapis.com/stub/v1/",
+    "batchPath": "batch",
+    "protocol": "rest",
+    "parameters": {},
+    "schemas": {"Item": {"id": "Item", "type": "object", "properties": {"id": {"type": "string"}}}},
+    "resources": {
+        "items": {
+            "methods": {
+                "get": {
+                    "id": "stub.items.get",
+                    "path": "items/{id}",
+                    "httpMethod": "GET",
+                    "parameters": {"id": {"type": "string", "required": True, "location": "path"}},
+                    "parameterOrder": ["id"],
+                    "response": {"$ref": "Item"},
+                }
+            }
+        }
+    },
+}
+
+
+class StubHttp:
+    """httplib2.Http stand-in that fails when used off its owning thread or concurrently."""
+
+    violations = []
+    in_flight = 0
+    peak = 0
+    counter_lock = threading.Lock()
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self.follow_redirects = True
+        self.owner = threading.get_ident()
+        self.busy = False
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        if threading.get_ident() != self.owner:
+            StubHttp.violations.append(f"{uri} used from a thread that does not own its connection")
+        if self.busy:
+            StubHttp.violations.append(f"{uri} sent on a connection that was already in use")
+        self.busy = True
+        with StubHttp.counter_lock:
+            StubHttp.in_flight += 1
+            StubHttp.peak = max(StubHttp.peak, StubHttp.in_flight)
+        try:
+            time.sleep(0.01)
+            item_id = uri.split("/items/")[1].split("?")[0]
+            return httplib2.Response({"status": "200"}), json.dumps({"id": item_id}).encode()
+        finally:
+            with StubHttp.counter_lock:
+                StubHttp.in_flight -= 1
+            self.busy = False
+
+
+@pytest.fixture
+def stub_client(tmp_path, monkeypatch):
+    token = tmp_path / "token.json"
+    token.write_text(json.dumps({
+        "token": "access-token",
+        "refresh_token": "refresh-token",
+        "client_id": "client-id",
+        "client_secret": "client-secret",
+        "expiry": "2999-01-01T00:00:00Z",
+    }))
+    StubHttp.violations = []
+    StubHttp.in_flight = StubHttp.peak = 0
+    monkeypatch.setattr(pool.httplib2, "Http", StubHttp)
+    monkeypatch.setattr(
+        pool, "build",
+        lambda service, version, cache_discovery=False, **kwargs: build_from_document(DISCOVERY, **kwargs),
+    )
+    monkeypatch.setattr(pool, "_local", threading.local())
+    pool.invalidate()
+    yield pool.get_service("stub", "v1", ["scope"], str(token))
+    pool.invalidate()
+
+
+def test_parallel_sessions_overlap_on_their_worker_connections(stub_client):
+    async def session(index):
+        return await aio.execute(lambda: stub_client.items().get(id=str(index)))
+
+    async def run_sessions():
+        return await asyncio.gather(*(session(i) for i in range(40)))
+
+    results = asyncio.run(run_sessions())
+
+    assert [r["id"] for r in results] == [str(i) for i in range(40)]
+    assert StubHttp.violations == []
+    # Sessions overlap on the executor instead of queueing behind each other.
+    assert StubHttp.peak > 1
@@ -0,0 +1,76 @@
+import time
+import pathlib
+from datetime import datetime
+
+from gcalender.calendar_utils import parse_datetime
+
+CORPUS_PATH = pathlib.Path(__file__).parent / "data" / "datetime_corpus.txt"
+
+# The strptime chain parse_datetime replaced, kept as the reference.
+LEGACY_FORMATS = [
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d %I:%M %p",
+    "%Y-%m-%d",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %I:%M %p",
+    "%m/%d/%Y",
+    "%B %d, %Y %H:%M",
+    "%B %d, %Y %I:%M %p",
+    "%B %d, %Y",
+]
+
+
+def legacy_parse(datetime_str):
+    for fmt in LEGACY_FORMATS:
+        try:
+            return datetime.strptime(datetime_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def load_corpus():
+    lines = CORPUS_PATH.read_text().splitlines()
+    return [line for line in lines if line.strip() and not line.startswith("#")]
+
+
+def test_accepts_everything_the_strptime_chain_accepted():
+    for text in load_corpus():
+        expected = legacy_parse(text)
+        if expected is not None:
+            assert parse_datetime(text) == expected, text
+
+
+def test_single_digit_minutes():
+    assert parse_datetime("2023-12-31 14:0") == datetime(2023, 12, 31, 14, 0)
+    assert parse_datetime("12/31/2023 2:5 PM") == datetime(2023, 12, 31, 14, 5)
+
+
+def test_rejects_invalid_dates_and_times():
+    for text in ["2024-02-30 08:15", "2023-12-31 25:00", "2023-12-31 14:60", "2023-12-31 13:00 PM",
+                 "tomorrow at 3pm", ""]:
+        assert parse_datetime(text) is None, text
+
+
+def test_parse_benchmark():
+    corpus = load_corpus()
+    rounds = 200
+    uncached = parse_datetime.__wrapped__
+
+    def timed(parse):
+        began = time.perf_counter()
+        for _ in range(rounds):
+            for text in corpus:
+                parse(text)
+        return time.perf_counter() - began
+
+    legacy = timed(legacy_parse)
+    new = timed(uncached)
+    parse_datetime.cache_clear()
+    cached = timed(parse_datetime)
+    print(
+        f"{rounds} x {len(corpus)} strings: strptime chain {legacy * 1000:.0f} ms, "
+        f"parse_datetime {new * 1000:.0f} ms uncached / {cached * 1000:.0f} ms cached"
+    )
+    assert new < legacy
+    assert cached < new
@@ -0,0 +1,59 @@
+from gcalender import create_events, event_store
+
+
+class FakeRequest:
+    def __init__(self, body):
+        self.body = body
+
+
+class FakeEvents:
+    def insert(self, calendarId, body, conferenceDataVersion):
+        return FakeRequest(body)
+
+
+class FakeBatch:
+    """Answers every request except the ones whose summary is in skip."""
+
+    def __init__(self, callback, skip):
+        self.callback = callback
+        self.skip = skip
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self.requests:
+            if request.body["summary"] in self.skip:
+                continue
+            event = {"id": f"id-{request_id}", "htmlLink": f"link-{request_id}", **request.body}
+            self.callback(request_id, event, None)
+
+
+class FakeService:
+    def __init__(self, skip=()):
+        self.skip = set(skip)
+
+    def events(self):
+        return FakeEvents()
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(callback, self.skip)
+
+
+def test_missing_batch_response_fails_only_that_event(monkeypatch):
+    service = FakeService(skip={"Lost"})
+    stored = []
+    monkeypatch.setattr(create_events, "get_client", lambda: service)
+    monkeypatch.setattr(create_events, "get_calendar_settings", lambda service: {"timezone": "UTC"})
+    monkeypatch.setattr(event_store, "apply_event", lambda service, event: stored.append(event["id"]))
+
+    result = create_events.create_events_bulk([
+        {"summary": "Kept", "start_time": "2024-05-03 09:00", "end_time": "2024-05-03 10:00"},
+        {"summary": "Lost", "start_time": "2024-05-03 11:00", "end_time": "2024-05-03 12:00"},
+    ])
+
+    assert result["status"] == "partial"
+    assert [r["status"] for r in result["results"]] == ["success", "error"]
+    assert result["results"][0]["event_id"] == "id-0"
+    assert stored == ["id-0"]
@@ -0,0 +1,156 @@
+import datetime
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from gcalender import delete_event, event_store
+
+
+class FakeRequest:
+    def __init__(self, method, kwargs, response=None):
+        self.method = method
+        self.kwargs = kwargs
+        self.response = response
+
+    def execute(self):
+        return self.response
+
+
+class FakeEvents:
+    def __init__(self, service):
+        self.service = service
+
+    def list(self, **kwargs):
+        self.service.list_calls.append(kwargs)
+        return FakeRequest("list", kwargs, {"items": self.service.items})
+
+    def delete(self, **kwargs):
+        return FakeRequest("delete", kwargs)
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.service.batches.append([request.kwargs["eventId"] for _, request in self.requests])
+        for request_id, request in self.requests:
+            self.callback(request_id, None, self.service.errors.get(request.kwargs["eventId"]))
+
+
+class FakeService:
+    """Records events.list calls and batch executions instead of calling Calendar."""
+
+    def __init__(self, items=(), errors=None):
+        self.items = list(items)
+        self.errors = errors or {}
+        self.list_calls = []
+        self.batches = []
+
+    def events(self):
+        return FakeEvents(self)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+def http_error(status):
+    return HttpError(httplib2.Response({"status": status}), b"")
+
+
+@pytest.fixture
+def removed(monkeypatch):
+    """Use the live API path (store not fresh) and capture store removals."""
+    removed = []
+    monkeypatch.setattr(event_store, "ensure_fresh", lambda service: False)
+    monkeypatch.setattr(event_store, "remove_events", removed.extend)
+    monkeypatch.setattr(delete_event, "get_calendar_settings", lambda service: {"timezone": "Europe/Berlin"})
+    return removed
+
+
+def test_find_events_resolves_name_and_date(removed):
+    service = FakeService(items=[
+        {"id": "a", "summary": "Team Standup"},
+        # Matched by q through its description only.
+        {"id": "b", "summary": "Lunch", "description": "after standup"},
+    ])
+    settings, start, end = delete_event._day_window(service, "2024-05-03")
+    events = delete_event.find_events(service, start, end, "standup", settings)
+
+    assert [event["id"] for event in events] == ["a"]
+    (call,) = service.list_calls
+    assert call["q"] == "standup"
+    assert call["timeMin"] == "2024-05-03T00:00:00+02:00"
+    assert call["timeMax"] == "2024-05-04T00:00:00+02:00"
+    assert call["timeZone"] == "Europe/Berlin"
+    assert call["singleEvents"] is True
+
+
+def test_delete_by_criteria_sends_one_batch(removed, monkeypatch):
+    service = FakeService(items=[{"id": f"e{i}", "summary": f"Review {i}"} for i in range(5)])
+    monkeypatch.setattr(delete_event, "get_client", lambda: service)
+
+    result = delete_event.delete_events_by_criteria(date="2024-05-03", name="review", confirm=True)
+
+    assert result["status"] == "success"
+    assert service.batches == [["e0", "e1", "e2", "e3", "e4"]]
+    assert removed == ["e0", "e1", "e2", "e3", "e4"]
+    assert [r["summary"] for r in result["results"]] == [f"Review {i}" for i in range(5)]
+
+
+def test_gone_event_counts_as_deleted(removed):
+    service = FakeService(errors={"gone": http_error(410), "denied": http_error(403)})
+
+    results = delete_event.delete_events_batch(service, ["ok", "gone", "denied"])
+
+    assert [r["status"] for r in results] == ["success", "success", "error"]
+    assert removed == ["ok", "gone"]
+    assert len(service.batches) == 1
+
+
+def test_delete_by_criteria_requires_confirmation(monkeypatch):
+    monkeypatch.setattr(delete_event, "get_client", pytest.fail)
+
+    result = delete_event.delete_events_by_criteria(date="2024-05-03", confirm=False)
+
+    assert result["status"] == "error"
+
+
+def test_all_failed_deletions_report_error(removed, monkeypatch):
+    service = FakeService(
+        items=[{"id": "a", "summary": "Review"}, {"id": "b", "summary": "Review"}],
+        errors={"a": http_error(403), "b": http_error(403)},
+    )
+    monkeypatch.setattr(delete_event, "get_client", lambda: service)
+
+    result = delete_event.delete_events_by_criteria(date="2024-05-03", name="review", confirm=True)
+
+    assert result["status"] == "error"
+    assert removed == []
+
+
+def test_stored_name_match_is_literal(tmp_path, monkeypatch):
+    monkeypatch.setattr(event_store, "STORE_PATH", str(tmp_path / "events.sqlite3"))
+    events = [
+        {"id": "a", "summary": "100% review", "start": {"dateTime": "2024-05-03T09:00:00Z"},
+         "end": {"dateTime": "2024-05-03T10:00:00Z"}},
+        {"id": "b", "summary": "1000 reviews", "start": {"dateTime": "2024-05-03T11:00:00Z"},
+         "end": {"dateTime": "2024-05-03T12:00:00Z"}},
+        {"id": "c", "summary": "q1_plan", "start": {"dateTime": "2024-05-03T13:00:00Z"},
+         "end": {"dateTime": "2024-05-03T14:00:00Z"}},
+        {"id": "d", "summary": "q1-plan", "start": {"dateTime": "2024-05-03T15:00:00Z"},
+         "end": {"dateTime": "2024-05-03T16:00:00Z"}},
+    ]
+    with event_store._connect() as conn:
+        event_store._store_events(conn, events, datetime.timezone.utc)
+    day = datetime.datetime(2024, 5, 3, tzinfo=datetime.timezone.utc)
+    start, end = day.timestamp(), (day + datetime.timedelta(days=1)).timestamp()
+
+    assert [e["id"] for e in event_store.events_between(start, end, name="100%")] == ["a"]
+    assert [e["id"] for e in event_store.events_between(start, end, name="q1_")] == ["c"]
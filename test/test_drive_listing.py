@@ -0,0 +1,38 @@
+import pytest
+
+from gdrive import agent
+
+
+class LiveListingForbidden:
+    def files(self):
+        pytest.fail("a store cursor must never reach files.list")
+
+
+def test_store_cursor_is_not_forwarded_when_store_goes_stale(monkeypatch):
+    monkeypatch.setattr(agent, "get_drive_client", LiveListingForbidden)
+    monkeypatch.setattr(agent.DRIVE_STORE, "ensure_fresh", lambda drive: False)
+
+    result = agent.list_drive_files(page_size=10, cursor=f"{agent.STORE_CURSOR_PREFIX}10")
+
+    assert result["status"] == "error"
+    assert result["resources"] == []
+    assert result["nextCursor"] is None
+
+
+def test_store_cursor_pages_locally_while_fresh(monkeypatch):
+    files = [{"id": f"f{i}", "name": f"File {i}", "mimeType": "text/plain"} for i in range(11)]
+    queries = []
+
+    def query(name_contains=None, limit=100, offset=0):
+        queries.append((limit, offset))
+        return files[offset:offset + limit]
+
+    monkeypatch.setattr(agent, "get_drive_client", LiveListingForbidden)
+    monkeypatch.setattr(agent.DRIVE_STORE, "ensure_fresh", lambda drive: True)
+    monkeypatch.setattr(agent.DRIVE_STORE, "query", query)
+
+    result = agent.list_drive_files(page_size=5, cursor=f"{agent.STORE_CURSOR_PREFIX}5")
+
+    assert [r["name"] for r in result["resources"]] == [f"File {i}" for i in range(5, 10)]
+    assert result["nextCursor"] == f"{agent.STORE_CURSOR_PREFIX}10"
+    assert queries == [(6, 5)]
@@ -0,0 +1,97 @@
+import time
+import random
+import datetime
+
+from gcalender.free_busy import find_slots, merge_intervals
+
+TZ = datetime.timezone(datetime.timedelta(hours=2))
+WORKING_HOURS = {"start": "09:00", "end": "17:00", "days": [0, 1, 2, 3, 4]}
+START = datetime.datetime(2024, 5, 6, tzinfo=TZ)  # a Monday
+
+
+def dense_calendar(calendars, days, blocks_per_day, seed=7):
+    """
+    Random busy blocks for many calendars over many days.
+
+    Blocks fall inside even hours (6:00-7:00, 8:00-9:00, ...) so the odd
+    hours stay free however many calendars are stacked.
+    """
+    rng = random.Random(seed)
+    busy = []
+    for _ in range(calendars):
+        for day in range(days):
+            midnight = START + datetime.timedelta(days=day)
+            for _ in range(blocks_per_day):
+                offset = rng.randrange(0, 55, 5)
+                begin = midnight + datetime.timedelta(hours=rng.randrange(6, 20, 2), minutes=offset)
+                busy.append((begin, begin + datetime.timedelta(minutes=rng.randrange(5, 61 - offset, 5))))
+    return busy
+
+
+def assert_valid(slots, busy, duration):
+    for slot_start, slot_end in slots:
+        assert slot_end - slot_start >= duration
+        local_start, local_end = slot_start.astimezone(TZ), slot_end.astimezone(TZ)
+        assert local_start.weekday() in WORKING_HOURS["days"]
+        assert local_start.date() == local_end.date()
+        assert local_start.time() >= datetime.time(9) and local_end.time() <= datetime.time(17)
+        assert all(slot_end <= b_start or slot_start >= b_end for b_start, b_end in busy)
+    for (_, previous_end), (next_start, _) in zip(slots, slots[1:]):
+        assert previous_end <= next_start
+
+
+def test_merge_intervals_is_sorted_and_disjoint():
+    busy = dense_calendar(calendars=5, days=3, blocks_per_day=6)
+    merged = merge_intervals(busy)
+
+    for (_, previous_end), (next_start, _) in zip(merged, merged[1:]):
+        assert previous_end < next_start
+    for start, end in busy:
+        assert any(m_start <= start and end <= m_end for m_start, m_end in merged)
+
+
+def test_slots_match_a_minute_by_minute_scan():
+    busy = dense_calendar(calendars=3, days=14, blocks_per_day=4)
+    duration = datetime.timedelta(minutes=30)
+    end = START + datetime.timedelta(days=14)
+
+    slots = find_slots(busy, START, end, duration, TZ, WORKING_HOURS, max_slots=10000)
+
+    # Reference: mark every free working minute, then collect runs of >= 30 minutes.
+    expected = []
+    run_start = None
+    minute = START
+    while minute < end:
+        free = (
+            minute.weekday() in WORKING_HOURS["days"]
+            and datetime.time(9) <= minute.time() < datetime.time(17)
+            and not any(b_start <= minute < b_end for b_start, b_end in busy)
+        )
+        if free and run_start is None:
+            run_start = minute
+        elif not free and run_start is not None:
+            if minute - run_start >= duration:
+                expected.append((run_start, minute))
+            run_start = None
+        minute += datetime.timedelta(minutes=1)
+    assert slots == expected
+    assert_valid(slots, busy, duration)
+
+
+def test_dense_calendar_benchmark():
+    # 50 calendars x 90 days x 8 blocks: 36,000 busy intervals.
+    busy = dense_calendar(calendars=50, days=90, blocks_per_day=8)
+    duration = datetime.timedelta(minutes=15)
+    end = START + datetime.timedelta(days=90)
+
+    began = time.perf_counter()
+    slots = find_slots(busy, START, end, duration, TZ, WORKING_HOURS, max_slots=10000)
+    elapsed = time.perf_counter() - began
+
+    weekdays = sum((START + datetime.timedelta(days=d)).weekday() < 5 for d in range(90))
+    # At least the four free odd hours (9, 11, 13, 15) of every working day.
+    assert len(slots) >= 4 * weekdays
+    assert_valid(slots[:200], busy, duration)
+    print(f"find_slots over {len(busy)} busy intervals: {len(slots)} slots in {elapsed * 1000:.1f} ms")
+    # Merging is O(n log n) and each window bisects into the merged list.
+    assert elapsed < 1.0
@@ -0,0 +1,61 @@
+import json
+
+from googleapiclient.discovery import build
+from googleapiclient.http import HttpMockSequence
+
+from gmail.listing import list_emails
+
+BOUNDARY = "batch_boundary"
+
+
+class RecordingHttp(HttpMockSequence):
+    """HttpMockSequence that records every round trip it serves."""
+
+    def __init__(self, iterable):
+        super().__init__(iterable)
+        self.calls = []
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        self.calls.append((method, uri.split("?")[0]))
+        return super().request(uri, method, body, headers, **kwargs)
+
+
+def batch_response(details):
+    """A multipart batch body answering request ids 0..n-1 in order."""
+    parts = []
+    for index, detail in enumerate(details):
+        parts.append(
+            f"--{BOUNDARY}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <response-item + {index}>\r\n\r\n"
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+            f"{json.dumps(detail)}\r\n"
+        )
+    return "".join(parts) + f"--{BOUNDARY}--"
+
+
+def test_listing_50_emails_costs_two_round_trips():
+    ids = [f"m{i}" for i in range(50)]
+    details = [
+        {"id": msg_id, "payload": {"headers": [
+            {"name": "Subject", "value": f"Subject {msg_id}"},
+            {"name": "From", "value": "sender@example.com"},
+        ]}}
+        for msg_id in ids
+    ]
+    http = RecordingHttp([
+        ({"status": "200"}, json.dumps({"messages": [{"id": msg_id} for msg_id in ids]})),
+        ({"status": "200", "content-type": f"multipart/mixed; boundary={BOUNDARY}"}, batch_response(details)),
+    ])
+    client = build("gmail", "v1", http=http, static_discovery=True)
+
+    emails = list_emails(client, "in:inbox", max_emails=50)
+
+    assert [email["id"] for email in emails] == ids
+    assert emails[0]["subject"] == "Subject m0"
+    # One messages.list plus one batch call, instead of 1 + 50 messages.get calls.
+    assert http.calls == [
+        ("GET", "https://gmail.googleapis.com/gmail/v1/users/me/messages"),
+        ("POST", "https://gmail.googleapis.com/batch"),
+    ]
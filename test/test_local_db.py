@@ -0,0 +1,85 @@
+import time
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from gclient.local_db import Syncer, connect, get_state, set_state
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS items (id TEXT PRIMARY KEY);"
+
+
+class FakeStore:
+    """Records bootstrap and sync calls; sync raises self.error when set."""
+
+    def __init__(self, path):
+        self.path = path
+        self.calls = []
+        self.error = None
+
+    def bootstrap(self, client):
+        self.calls.append(("bootstrap", client))
+        with connect(self.path, SCHEMA) as conn:
+            set_state(conn, cursor="c1", synced_at=time.time())
+
+    def sync(self, client, token):
+        self.calls.append(("sync", token))
+        if self.error:
+            raise self.error
+        with connect(self.path, SCHEMA) as conn:
+            set_state(conn, cursor="c2", synced_at=time.time())
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FakeStore(str(tmp_path / "store.sqlite3"))
+    store.syncer = Syncer(store.path, SCHEMA, "Test store", "cursor", store.bootstrap, store.sync, (410,))
+    return store
+
+
+def bootstrap(store, fingerprint):
+    assert store.syncer.ensure_fresh("client", fingerprint, max_age=60) is False
+    # The thread clears itself when done.
+    while store.syncer._bootstrap_thread is not None:
+        time.sleep(0.01)
+
+
+def test_bootstraps_in_background_then_serves(store):
+    bootstrap(store, "fp1")
+
+    assert store.syncer.ensure_fresh("client", "fp1", max_age=60) is True
+    assert store.calls == [("bootstrap", "client")]
+
+
+def test_stale_store_syncs_from_cursor(store):
+    bootstrap(store, "fp1")
+
+    assert store.syncer.ensure_fresh("client", "fp1", max_age=-1) is True
+    assert store.calls[-1] == ("sync", "c1")
+
+
+def test_new_credentials_rebuild_the_store(store):
+    bootstrap(store, "fp1")
+    bootstrap(store, "fp2")
+
+    assert [call[0] for call in store.calls] == ["bootstrap", "bootstrap"]
+    with connect(store.path, SCHEMA) as conn:
+        assert get_state(conn, "fingerprint") == "fp2"
+
+
+def test_expired_cursor_is_reset(store):
+    bootstrap(store, "fp1")
+    store.error = HttpError(httplib2.Response({"status": 410}), b"")
+
+    assert store.syncer.ensure_fresh("client", "fp1", max_age=-1) is False
+    with connect(store.path, SCHEMA) as conn:
+        assert get_state(conn, "cursor") is None
+
+
+def test_other_errors_keep_the_cursor(store):
+    bootstrap(store, "fp1")
+    store.error = HttpError(httplib2.Response({"status": 500}), b"")
+
+    assert store.syncer.ensure_fresh("client", "fp1", max_age=-1) is False
+    with connect(store.path, SCHEMA) as conn:
+        assert get_state(conn, "cursor") == "c1"
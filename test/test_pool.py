@@ -0,0 +1,40 @@
+import json
+import threading
+
+from gclient import pool
+
+TOKEN = {
+    "token": "access-token",
+    "refresh_token": "refresh-token",
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "expiry": "2999-01-01T00:00:00Z",
+}
+
+
+def test_login_for_one_token_file_does_not_block_others(tmp_path):
+    pending = tmp_path / "pending.json"
+    ready = tmp_path / "ready.json"
+    ready.write_text(json.dumps(TOKEN))
+    login_started = threading.Event()
+    finish_login = threading.Event()
+
+    def authenticate():
+        # Stands in for the browser OAuth flow.
+        login_started.set()
+        finish_login.wait(5)
+        pending.write_text(json.dumps(TOKEN))
+
+    pool.invalidate()
+    login = threading.Thread(target=pool.get_credentials, args=(str(pending), ["scope"], authenticate))
+    login.start()
+    try:
+        assert login_started.wait(5)
+        lookup = threading.Thread(target=pool.get_credentials, args=(str(ready), ["scope"]))
+        lookup.start()
+        lookup.join(2)
+        assert not lookup.is_alive()
+    finally:
+        finish_login.set()
+        login.join(5)
+        pool.invalidate()
@@ -0,0 +1,88 @@
+import json
+
+from googleapiclient.discovery import build
+from googleapiclient.http import HttpMockSequence
+
+from gdrive import uploader
+
+MB = 1024 * 1024
+SESSION_URI = "https://www.googleapis.com/upload/drive/v3/files?upload_id=session-1"
+FILE = {"id": "f1", "name": "big.bin"}
+
+
+class RecordingHttp(HttpMockSequence):
+    """HttpMockSequence that records each request and the saved sessions at that moment."""
+
+    def __init__(self, iterable):
+        super().__init__(iterable)
+        self.calls = []
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        saved = [s["uri"] for s in uploader._load_sessions().values()]
+        self.calls.append((method, uri, dict(headers or {}), saved))
+        return super().request(uri, method, body, headers, **kwargs)
+
+
+def make_file(tmp_path, monkeypatch, size):
+    monkeypatch.setattr(uploader, "SESSIONS_PATH", str(tmp_path / "sessions.json"))
+    path = tmp_path / "big.bin"
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+
+def test_session_is_saved_before_the_first_chunk(tmp_path, monkeypatch):
+    path = make_file(tmp_path, monkeypatch, MB + MB // 2)
+    http = RecordingHttp([
+        ({"status": "200", "location": SESSION_URI}, ""),
+        ({"status": "308", "range": f"bytes=0-{MB - 1}"}, ""),
+        ({"status": "200"}, json.dumps(FILE)),
+    ])
+    drive = build("drive", "v3", http=http, static_discovery=True)
+
+    file, resumed = uploader.upload_file(drive, path, "big.bin", chunk_size_mb=1)
+
+    assert (file, resumed) == (FILE, False)
+    first_chunk = http.calls[1]
+    assert first_chunk[:2] == ("PUT", SESSION_URI)
+    assert first_chunk[2]["Content-Range"] == f"bytes 0-{MB - 1}/{MB + MB // 2}"
+    # A crash during the first chunk can still resume.
+    assert first_chunk[3] == [SESSION_URI]
+    assert uploader._load_sessions() == {}
+
+
+def test_resume_asks_drive_for_the_offset(tmp_path, monkeypatch):
+    size = MB + MB // 2
+    path = make_file(tmp_path, monkeypatch, size)
+    uploader._update_session(uploader.session_key(path, "big.bin", ""), SESSION_URI)
+    http = RecordingHttp([
+        ({"status": "308", "range": f"bytes=0-{MB - 1}"}, ""),
+        ({"status": "200"}, json.dumps(FILE)),
+    ])
+    drive = build("drive", "v3", http=http, static_discovery=True)
+
+    file, resumed = uploader.upload_file(drive, path, "big.bin", chunk_size_mb=1)
+
+    assert (file, resumed) == (FILE, True)
+    (query_method, query_uri, query_headers, _), (_, chunk_uri, chunk_headers, _) = http.calls
+    assert (query_method, query_uri) == ("PUT", SESSION_URI)
+    assert query_headers["Content-Range"] == f"bytes */{size}"
+    assert chunk_uri == SESSION_URI
+    assert chunk_headers["Content-Range"] == f"bytes {MB}-{size - 1}/{size}"
+
+
+def test_expired_session_starts_over(tmp_path, monkeypatch):
+    path = make_file(tmp_path, monkeypatch, MB // 2)
+    uploader._update_session(uploader.session_key(path, "big.bin", ""), SESSION_URI)
+    new_uri = SESSION_URI.replace("session-1", "session-2")
+    http = RecordingHttp([
+        ({"status": "404"}, ""),
+        ({"status": "200", "location": new_uri}, ""),
+        ({"status": "200"}, json.dumps(FILE)),
+    ])
+    drive = build("drive", "v3", http=http, static_discovery=True)
+
+    file, resumed = uploader.upload_file(drive, path, "big.bin", chunk_size_mb=1)
+
+    assert (file, resumed) == (FILE, False)
+    assert [call[0] for call in http.calls] == ["PUT", "POST", "PUT"]
+    assert http.calls[2][1] == new_uri